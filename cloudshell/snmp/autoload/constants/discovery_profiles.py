@@ -0,0 +1,6 @@
+# hierarchy, ports and port channels without their attribute tables
+MINIMAL = "minimal"
+# IP addresses, duplex and port channel members, without LLDP and MAU-MIB
+STANDARD = "standard"
+# every attribute table including the registered providers
+FULL = "full"
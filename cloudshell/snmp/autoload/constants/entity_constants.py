@@ -31,6 +31,7 @@ ENTITY_SERIAL = SnmpMibObject("ENTITY-MIB", "entPhysicalSerialNum")
 ENTITY_OS_VERSION = SnmpMibObject("ENTITY-MIB", "entPhysicalSoftwareRev")
 ENTITY_HW_VERSION = SnmpMibObject("ENTITY-MIB", "entPhysicalHardwareRev")
 ENTITY_TO_IF_ID = SnmpMibObject("ENTITY-MIB", "entAliasMappingIdentifier")
+ENTITY_LAST_CHANGE_TIME = SnmpMibObject("ENTITY-MIB", "entLastChangeTime", "0")
 
 ENTITY_TABLE_REQUIRED_COLUMNS = [
     ENTITY_POSITION,
@@ -44,3 +45,15 @@ ENTITY_TABLE_REQUIRED_COLUMNS = [
     ENTITY_OS_VERSION,
     ENTITY_HW_VERSION,
 ]
+
+# columns needed to classify an entity and keep its place in the containment tree
+ENTITY_TABLE_CLASSIFICATION_COLUMNS = [
+    ENTITY_PARENT_ID,
+    ENTITY_CLASS,
+    ENTITY_VENDOR_TYPE,
+]
+ENTITY_TABLE_DETAILS_COLUMNS = [
+    column
+    for column in ENTITY_TABLE_REQUIRED_COLUMNS
+    if column not in ENTITY_TABLE_CLASSIFICATION_COLUMNS
+]
@@ -5,6 +5,7 @@ from cloudshell.snmp.core.domain.snmp_oid import SnmpMibObject
 SPECIAL_SYMBOLS = re.escape(".-|_[]")
 CS_NOT_ALLOWED_STR_PATTERN = re.compile(rf"[^a-zA-Z\d\s{SPECIAL_SYMBOLS}]")
 
+PORT_NUMBER = SnmpMibObject("IF-MIB", "ifNumber", "0")
 PORT_INDEX = SnmpMibObject("IF-MIB", "ifIndex")
 PORT_DESCR_NAME = SnmpMibObject("IF-MIB", "ifDescr")
 PORT_NAME = SnmpMibObject("IF-MIB", "ifName")
@@ -41,6 +42,19 @@ IF_TABLE = [
     PORT_SPEED,
     PORT_MAC,
 ]
+
+# columns needed to classify an interface as a port or a port channel
+IF_TABLE_CLASSIFICATION_COLUMNS = [
+    PORT_DESCR_NAME,
+    PORT_NAME,
+    PORT_TYPE,
+]
+# ifIndex is the index of the row already
+IF_TABLE_DETAILS_COLUMNS = [
+    column
+    for column in IF_TABLE
+    if column not in IF_TABLE_CLASSIFICATION_COLUMNS and column is not PORT_INDEX
+]
 PORT_DUPLEX_TABLE = [PORT_DUPLEX_INDEX, PORT_DUPLEX_DATA]
 PORT_LLDP_LOC_TABLE = [
     PORT_ADJACENT_LOC_DESC,
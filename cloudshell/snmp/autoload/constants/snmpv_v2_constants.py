@@ -5,3 +5,4 @@ SYS_LOCATION = SnmpMibObject("SNMPv2-MIB", "sysLocation", "0")
 SYS_CONTACT = SnmpMibObject("SNMPv2-MIB", "sysContact", "0")
 SYS_NAME = SnmpMibObject("SNMPv2-MIB", "sysName", "0")
 SYS_OBJECT_ID = SnmpMibObject("SNMPv2-MIB", "sysObjectID", "0")
+SYS_UP_TIME = SnmpMibObject("SNMPv2-MIB", "sysUpTime", "0")
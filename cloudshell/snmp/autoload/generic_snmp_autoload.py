@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from contextlib import suppress
-from functools import lru_cache
 from typing import TYPE_CHECKING
 
+from cloudshell.snmp.autoload.constants import discovery_profiles
 from cloudshell.snmp.autoload.exceptions.snmp_autoload_error import GeneralAutoloadError
 from cloudshell.snmp.autoload.helper.port_helper import PortHelper
 from cloudshell.snmp.autoload.helper.snmp_autoload_helper import log_autoload_details
+from cloudshell.snmp.autoload.helper.string_intern_table import StringInternTable
+from cloudshell.snmp.autoload.helper.synchronized_snmp_service import (
+    SynchronizedSnmpService,
+)
 from cloudshell.snmp.autoload.services.physical_entities_table import PhysicalTable
 from cloudshell.snmp.autoload.services.port_mapping_table import PortMappingService
 from cloudshell.snmp.autoload.services.port_table import PortsTable
@@ -22,6 +26,9 @@ if TYPE_CHECKING:
 
     from cloudshell.snmp.core.snmp_service import SnmpService
 
+    from cloudshell.snmp.autoload.helper.entity_snapshot_cache import (
+        EntitySnapshotCache,
+    )
     from cloudshell.snmp.autoload.helper.types.resource_model import ResourceModelProto
 
 
@@ -39,48 +46,78 @@ class GenericSNMPAutoload:
         :param resource_model: Represents Resource Model according to a standard
         :type resource_model: cloudshell.shell.standards.autoload_generic_models.GenericResourceModel  # noqa: E501
         """
-        self.snmp_handler = snmp_handler
+        # tables are loaded in threads of their own
+        self.snmp_handler = SynchronizedSnmpService.wrap(snmp_handler)
         self.logger = logger
         self.elements = {}
         self._entity_table = None
         self._port_snmp_table = None
+        self._port_snmp_mapping_table = None
         self._if_table = None
         self._port_table = None
         self._system_info = None
         self._resource_model = resource_model
         self._validate_module_id_by_port_name = False
+        self._selective_entity_retrieval = False
+        self._selective_if_retrieval = False
+        self._entity_snapshot_cache = None
+        self._device_id = None
+        self._root_entity_index = None
+        self._intern_table = StringInternTable()
         self._port_table_service = None
         self._physical_table_service = None
         self._port_mapping_service = None
 
     @property
-    @lru_cache()
     def system_info_service(self) -> SnmpSystemInfo:
-        return SnmpSystemInfo(self.snmp_handler, self.logger)
+        if not self._system_info:
+            self._system_info = SnmpSystemInfo(self.snmp_handler, self.logger)
+        return self._system_info
 
     @property
-    @lru_cache()
     def port_snmp_mapping_table(self) -> SnmpPortMappingTable:
-        return SnmpPortMappingTable(
-            snmp_handler=self.snmp_handler,
-            logger=self.logger,
-        )
+        if not self._port_snmp_mapping_table:
+            physical_indexes = None
+            snapshot = None
+            if self._root_entity_index is not None:
+                physical_indexes = self.snmp_physical_structure.subtree_indexes
+            elif self._entity_snapshot_cache is not None:
+                # entLastChangeTime covers entAliasMappingTable as well
+                snapshot = self.snmp_physical_structure.snapshot
+            self._port_snmp_mapping_table = SnmpPortMappingTable(
+                snmp_handler=self.snmp_handler,
+                logger=self.logger,
+                physical_indexes=physical_indexes,
+                snapshot=snapshot,
+            )
+        return self._port_snmp_mapping_table
 
     @property
-    @lru_cache()
     def snmp_physical_structure(self) -> SnmpEntityTable:
-        return SnmpEntityTable(
-            snmp_handler=self.snmp_handler,
-            logger=self.logger,
-        )
+        if not self._entity_table:
+            entity_table = SnmpEntityTable(
+                snmp_handler=self.snmp_handler,
+                logger=self.logger,
+                selective_retrieval=self._selective_entity_retrieval,
+                root_index=self._root_entity_index,
+            )
+            if (
+                self._entity_snapshot_cache is not None
+                and self._root_entity_index is None
+            ):
+                self._restore_entity_snapshot(entity_table)
+            self._entity_table = entity_table
+        return self._entity_table
 
     @property
-    @lru_cache()
     def port_snmp_table(self) -> SnmpPortsTable:
-        return SnmpPortsTable(
-            snmp_handler=self.snmp_handler,
-            logger=self.logger,
-        )
+        if not self._port_snmp_table:
+            self._port_snmp_table = SnmpPortsTable(
+                snmp_handler=self.snmp_handler,
+                logger=self.logger,
+                selective_retrieval=self._selective_if_retrieval,
+            )
+        return self._port_snmp_table
 
     @property
     def port_table_service(self) -> PortsTable:
@@ -89,6 +126,7 @@ class GenericSNMPAutoload:
                 resource_model=self._resource_model,
                 ports_snmp_table=self.port_snmp_table,
                 logger=self.logger,
+                intern_table=self._intern_table,
             )
         return self._port_table_service
 
@@ -99,6 +137,7 @@ class GenericSNMPAutoload:
                 entity_table=self.snmp_physical_structure,
                 logger=self.logger,
                 resource_model=self._resource_model,
+                intern_table=self._intern_table,
             )
         return self._physical_table_service
 
@@ -113,6 +152,50 @@ class GenericSNMPAutoload:
             )
         return self._port_mapping_service
 
+    def set_selective_entity_retrieval(self, enabled: bool = True) -> None:
+        """Walk only ENTITY-MIB columns needed to classify entities.
+
+        The rest of the columns are loaded with GET requests only for entities
+        that can become chassis, modules, ports or power supplies.
+        Has to be set before the discovery.
+        """
+        self._selective_entity_retrieval = enabled
+
+    def set_selective_if_retrieval(self, enabled: bool = True) -> None:
+        """Walk only IF-MIB columns needed to classify interfaces.
+
+        ifType, ifName and ifDescr are walked first, the rest of the columns
+        are loaded with GET requests only for ports and port channels, so
+        sub-interfaces, VLANs and tunnels cost three columns.
+        Has to be set before the discovery.
+        """
+        self._selective_if_retrieval = enabled
+
+    def set_entity_snapshot_cache(
+        self, entity_snapshot_cache: EntitySnapshotCache, device_id: str
+    ) -> None:
+        """Reuse ENTITY-MIB data of the previous discovery of the device.
+
+        The data is reused while entLastChangeTime of the device is the same
+        and the device wasn't rebooted, otherwise ENTITY-MIB is loaded and the
+        snapshot is replaced.
+        The cache has to outlive the autoload and be set before the discovery.
+        """
+        self._entity_snapshot_cache = entity_snapshot_cache
+        self._device_id = device_id
+
+    def set_root_entity(self, root_index: str | None) -> None:
+        """Discover only the hardware contained in the entity.
+
+        For example a slot or a stack member with its modules, ports and their
+        attributes. Only entPhysicalContainedIn is walked, the rest of ENTITY-MIB
+        and IF-MIB rows are loaded with GET requests for the subtree.
+        Has to be set before the discovery.
+
+        :param root_index: entPhysicalIndex of the entity, None for the device
+        """
+        self._root_entity_index = root_index
+
     def load_mibs(self, path: str) -> None:
         """Loads mibs inside snmp handler."""
         self.snmp_handler.add_mib_folder_path(path)
@@ -120,18 +203,24 @@ class GenericSNMPAutoload:
     def discover(
         self,
         supported_os: list[str] | str,
+        profile: str = discovery_profiles.FULL,
     ):
         """An entry point for autoload.
 
         Read device structure and attributes:
         chassis, modules, submodules, ports, port-channels and power supplies.
 
+        :param profile: discovery profile choosing the port attribute tables
+            fetched, MINIMAL, STANDARD or FULL of discovery_profiles
+
         :rtype: cloudshell.shell.core.driver_context.AutoLoadDetails
         """
         try:
+            self.port_snmp_table.set_profile(profile)
             if not self.system_info_service.is_valid_device_os(supported_os):
                 raise GeneralAutoloadError("Unsupported device OS")
 
+            self.port_snmp_table.start_loading()
             self.logger.info("*" * 70)
             self.logger.info("Start SNMP discovery process .....")
             self.system_info_service.fill_attributes(self._resource_model)
@@ -139,6 +228,8 @@ class GenericSNMPAutoload:
             self._build_power_ports()
             self._build_ports_structure()
             self._get_port_channels()
+            self._save_entity_snapshot()
+            self._compact()
             self.logger.info("SNMP discovery process finished successfully")
 
             autoload_details = self._resource_model.build()
@@ -148,6 +239,33 @@ class GenericSNMPAutoload:
         finally:
             self._destroy_threads()
 
+    def _restore_entity_snapshot(self, entity_table: SnmpEntityTable) -> None:
+        # entLastChangeTime has to be read before ENTITY-MIB is loaded
+        last_change_time = entity_table.last_change_time
+        snapshot = self._entity_snapshot_cache.get(
+            self._device_id, last_change_time, entity_table.boot_time
+        )
+        if snapshot:
+            self.logger.info(
+                f"ENTITY-MIB is not changed since {last_change_time}, "
+                f"reusing the previous discovery"
+            )
+            entity_table.restore_snapshot(snapshot)
+
+    def _save_entity_snapshot(self) -> None:
+        if self._entity_snapshot_cache is None or self._root_entity_index is not None:
+            return
+        self._entity_snapshot_cache.put(
+            self._device_id, self.snmp_physical_structure.snapshot
+        )
+
+    def _compact(self) -> None:
+        """Release raw SNMP tables, every resource is already built from them."""
+        self.physical_table_service.compact()
+        self.snmp_physical_structure.compact()
+        self.port_table_service.compact()
+        self.port_snmp_table.compact()
+
     def _build_power_ports(self) -> None:
         for (
             power_port_id,
@@ -168,6 +286,10 @@ class GenericSNMPAutoload:
         Get resource details and attributes for every port
         base on data from IF-MIB Table.
         """
+        if self._root_entity_index is not None:
+            self.port_snmp_table.set_if_indexes(
+                self.port_snmp_mapping_table.port_mapping_snmp_table
+            )
         port_helper = PortHelper(
             physical_table_service=self.physical_table_service,
             port_table_service=self.port_table_service,
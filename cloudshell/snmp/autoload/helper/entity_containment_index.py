@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Callable, Tuple
+
+if TYPE_CHECKING:
+    PhysId = str
+    # physical class resolved by the EntityHelper and module exclusion flag
+    EntityKind = Tuple[str, bool]
+
+
+class EntityContainmentIndex:
+    """Containment tree of the ENTITY-MIB.
+
+    Built in a single pass over entPhysicalContainedIn, nearest module,
+    container and chassis ancestors are resolved once per entPhysicalIndex,
+    so every ancestor query is a plain dict lookup without recursion.
+    """
+
+    CONTAINER_CLASSES = ("container", "backplane")
+
+    def __init__(
+        self,
+        parents: dict[PhysId, PhysId],
+        entity_kinds: dict[PhysId, EntityKind],
+    ):
+        """Init.
+
+        :param parents: entPhysicalIndex to entPhysicalContainedIn map
+        :param entity_kinds: entPhysicalIndex to (physical class, is excluded) map,
+            indexes without an ENTITY-MIB row are absent
+        """
+        self._parents = parents
+        self._entity_kinds = entity_kinds
+        self.children: dict[PhysId, list[PhysId]] = defaultdict(list)
+        for index, parent_index in parents.items():
+            self.children[parent_index].append(index)
+
+        self._module_ancestors = self._resolve(
+            is_target=self._is_module_or_chassis,
+            is_transparent=lambda kind: kind is not None,
+        )
+        self._container_ancestors = self._resolve(
+            is_target=self._is_container,
+            is_transparent=self._is_container_transparent,
+        )
+        self._chassis_ancestors = self._resolve(
+            is_target=self._is_chassis,
+            is_transparent=lambda kind: True,
+        )
+
+    def get_parent(self, index: PhysId) -> PhysId | None:
+        return self._parents.get(index)
+
+    def get_parent_module(self, index: PhysId) -> PhysId | None:
+        """Nearest not excluded module or chassis above the entity."""
+        return self._module_ancestors.get(index)
+
+    def get_parent_container(self, index: PhysId) -> PhysId | None:
+        """Nearest container or backplane above the entity.
+
+        Only excluded entities and ports are looked through.
+        """
+        return self._container_ancestors.get(index)
+
+    def get_parent_chassis(self, index: PhysId) -> PhysId | None:
+        return self._chassis_ancestors.get(index)
+
+    @staticmethod
+    def _is_module_or_chassis(kind: EntityKind | None) -> bool:
+        if kind is None:
+            return False
+        entity_class, excluded = kind
+        return ("module" in entity_class and not excluded) or "chassis" in entity_class
+
+    def _is_container(self, kind: EntityKind | None) -> bool:
+        return kind is not None and kind[0] in self.CONTAINER_CLASSES
+
+    @staticmethod
+    def _is_container_transparent(kind: EntityKind | None) -> bool:
+        if kind is None:
+            return False
+        entity_class, excluded = kind
+        return excluded or "port" in entity_class
+
+    @staticmethod
+    def _is_chassis(kind: EntityKind | None) -> bool:
+        return kind is not None and "chassis" in kind[0]
+
+    def _resolve(
+        self,
+        is_target: Callable[[EntityKind | None], bool],
+        is_transparent: Callable[[EntityKind | None], bool],
+    ) -> dict[PhysId, PhysId | None]:
+        """Resolve the nearest matching ancestor for every entity.
+
+        Walks up from each entity until it reaches a matching parent, a parent
+        that can't be looked through, or an entity that is already resolved.
+        Every entity on the walked path shares the same answer, so each one is
+        visited once. Loops in entPhysicalContainedIn resolve to None.
+        """
+        resolved: dict[PhysId, PhysId | None] = {}
+        for index in self._parents:
+            path = []
+            on_path = set()
+            current = index
+            result = None
+            while True:
+                if current in resolved:
+                    result = resolved[current]
+                    break
+                if current in on_path:
+                    break
+                path.append(current)
+                on_path.add(current)
+                parent_index = self._parents.get(current)
+                if not parent_index:
+                    break
+                kind = self._entity_kinds.get(parent_index)
+                if is_target(kind):
+                    result = parent_index
+                    break
+                if not is_transparent(kind):
+                    break
+                current = parent_index
+            for item in path:
+                resolved[item] = result
+        return resolved
@@ -1,10 +1,15 @@
+import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict, namedtuple
+from threading import Lock
 
 from cloudshell.snmp.autoload.constants.entity_constants import (
     ENTITY_VENDOR_TYPE_TO_CLASS_MAP,
 )
 from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import BaseEntity
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
 
 class EntityHelperAbc(ABC):
     @abstractmethod
@@ -14,19 +19,84 @@ class EntityHelperAbc(ABC):
 
 class EntityHelper(EntityHelperAbc):
     ENTITY_SAFE_CLASS_LIST = ["port", "powersupply"]
+    CACHE_MAX_SIZE = 1024
+
+    def __init__(self):
+        self._class_cache = OrderedDict()
+        self._cache_lock = Lock()
+        self._vendor_type_pattern = None
+        self._vendor_type_classes = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def vendor_type_pattern(self):
+        """All ENTITY_VENDOR_TYPE_TO_CLASS_MAP patterns combined into one.
+
+        Patterns are joined in reverse order, so as before the last matching
+        pattern of the map decides the class.
+        """
+        if not self._vendor_type_pattern:
+            groups = []
+            for group_id, (pattern, entity_class) in enumerate(
+                reversed(ENTITY_VENDOR_TYPE_TO_CLASS_MAP.items())
+            ):
+                group_name = f"class_{group_id}"
+                self._vendor_type_classes[group_name] = entity_class
+                groups.append(f"(?P<{group_name}>{pattern.pattern})")
+            self._vendor_type_pattern = re.compile("|".join(groups), re.IGNORECASE)
+        return self._vendor_type_pattern
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self.cache_hits,
+            self.cache_misses,
+            self.CACHE_MAX_SIZE,
+            len(self._class_cache),
+        )
 
     def get_physical_class(self, entity: BaseEntity) -> str:
         entity_class = entity.entity_class
+        vendor_type_label = None
+        is_named_chassis = False
+        if entity.vendor_type:
+            vendor_type_label = entity.vendor_type_label
+        elif entity.position_id == "-1":
+            is_named_chassis = (
+                "chassis" in entity.name.lower()
+                or "chassis" in entity.description.lower()
+            )
+        key = (
+            entity_class,
+            vendor_type_label,
+            entity.position_id == "-1",
+            is_named_chassis,
+        )
+        with self._cache_lock:
+            result = self._class_cache.get(key)
+            if result is not None:
+                self.cache_hits += 1
+                self._class_cache.move_to_end(key)
+                return result
+            self.cache_misses += 1
+
+        result = self._get_physical_class(
+            entity_class, vendor_type_label, is_named_chassis
+        )
+        with self._cache_lock:
+            self._class_cache[key] = result
+            if len(self._class_cache) > self.CACHE_MAX_SIZE:
+                self._class_cache.popitem(last=False)
+        return result
+
+    def _get_physical_class(self, entity_class, vendor_type_label, is_named_chassis):
         if not entity_class or "other" in entity_class:
-            if not entity.vendor_type:
-                if entity.position_id == "-1" and (
-                    "chassis" in entity.name.lower()
-                    or "chassis" in entity.description.lower()
-                ):
+            if vendor_type_label is None:
+                if is_named_chassis:
                     return "chassis"
                 return ""
-            for key, value in ENTITY_VENDOR_TYPE_TO_CLASS_MAP.items():
-                if key.search(entity.vendor_type_label):
-                    entity_class = value
+            match = self.vendor_type_pattern.search(vendor_type_label)
+            if match:
+                entity_class = self._vendor_type_classes[match.lastgroup]
 
         return entity_class
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+
+if TYPE_CHECKING:
+    PhysId = str
+
+
+def is_last_change_time_supported(last_change_time: str | None) -> bool:
+    """Agents that never update entLastChangeTime report 0."""
+    return bool(last_change_time) and last_change_time != "0"
+
+
+class SnapshotValue:
+    """Decoded value of an SNMP response, kept without the SNMP engine."""
+
+    __slots__ = ("safe_value",)
+
+    def __init__(self, safe_value: str):
+        self.safe_value = safe_value
+
+
+class EntitySnapshot:
+    """ENTITY-MIB data of a device loaded by a discovery."""
+
+    def __init__(self):
+        self.last_change_time: str | None = None
+        # time.time() of the device boot estimated from sysUpTime
+        self.boot_time: float | None = None
+        self.physical_structure_snmp_table: QualiMibTable | None = None
+        self.physical_structure_table: dict[PhysId, PhysId] | None = None
+        self.port_mapping_snmp_table: dict[str, PhysId] | None = None
+        # module exclude pattern to indexes ingested by the PhysicalTable
+        # and their EntityContainmentIndex
+        self.ingestions: dict[str, tuple] = {}
+
+    @property
+    def is_complete(self) -> bool:
+        return (
+            is_last_change_time_supported(self.last_change_time)
+            and self.boot_time is not None
+            and self.physical_structure_snmp_table is not None
+        )
+
+    def decoded(self) -> EntitySnapshot:
+        """Copy with decoded values only, SNMP responses aren't referenced."""
+        snapshot = EntitySnapshot()
+        snapshot.last_change_time = self.last_change_time
+        snapshot.boot_time = self.boot_time
+        snapshot.physical_structure_snmp_table = QualiMibTable(
+            "entPhysicalTable",
+            (
+                (index, {k: SnapshotValue(v.safe_value) for k, v in row.items()})
+                for index, row in self.physical_structure_snmp_table.items()
+            ),
+        )
+        snapshot.physical_structure_table = self.physical_structure_table
+        snapshot.port_mapping_snmp_table = self.port_mapping_snmp_table
+        snapshot.ingestions = dict(self.ingestions)
+        return snapshot
+
+
+class EntitySnapshotCache:
+    """ENTITY-MIB snapshots of devices kept between discoveries.
+
+    A snapshot is reused only while entLastChangeTime of the device is the same,
+    the agent updates it on every change of the physical entities. The value
+    is relative to sysUpTime and can repeat after a reboot, so the snapshot is
+    dropped once the device is booted again.
+    """
+
+    BOOT_TIME_TOLERANCE = 60  # seconds of sysUpTime drift and request latency
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size
+        self._snapshots: OrderedDict[str, EntitySnapshot] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def get(
+        self, device_id: str, last_change_time: str, boot_time: float | None
+    ) -> EntitySnapshot | None:
+        if not is_last_change_time_supported(last_change_time) or boot_time is None:
+            return None
+        with self._lock:
+            snapshot = self._snapshots.get(device_id)
+            if snapshot is None:
+                return None
+            if abs(snapshot.boot_time - boot_time) > self.BOOT_TIME_TOLERANCE:
+                del self._snapshots[device_id]
+                return None
+            if snapshot.last_change_time != last_change_time:
+                return None
+            self._snapshots.move_to_end(device_id)
+            return snapshot
+
+    def put(self, device_id: str, snapshot: EntitySnapshot) -> None:
+        if not snapshot.is_complete:
+            return
+        snapshot = snapshot.decoded()
+        with self._lock:
+            self._snapshots[device_id] = snapshot
+            self._snapshots.move_to_end(device_id)
+            if self.max_size is not None and len(self._snapshots) > self.max_size:
+                self._snapshots.popitem(last=False)
+
+    def invalidate(self, device_id: str) -> None:
+        with self._lock:
+            self._snapshots.pop(device_id, None)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+from typing import Tuple
+
+PORT = "port"
+PORT_CHANNEL = "port_channel"
+EXCLUDED = "excluded"
+
+# ifType is a valid port channel type, ifType is a valid port type
+TypeVerdict = Tuple[bool, bool]
+
+
+class InterfaceClassifier:
+    """Port, port channel or excluded verdict for an IF-MIB interface.
+
+    There are only a few ifType values on a device, so the type patterns are
+    checked once per ifType and the verdict decides which name patterns are
+    worth checking at all. Patterns are compiled case-insensitive, so names
+    are not lowered. Lists are the ones of the PortsTable, empty lists
+    disable their check.
+    """
+
+    def __init__(
+        self,
+        port_channel_valid_types: list[str],
+        port_channel_names: list[str],
+        port_channel_excludes: list[str],
+        port_valid_types: list[str],
+        port_names: list[str],
+        port_excludes: list[str],
+    ):
+        self._port_channel_type_re = self._compile(port_channel_valid_types)
+        self._port_channel_name_re = self._compile(port_channel_names)
+        self._port_channel_exclude_re = self._compile(port_channel_excludes)
+        self._port_type_re = self._compile(port_valid_types)
+        self._port_name_re = self._compile(port_names)
+        self._port_exclude_re = self._compile(port_excludes)
+        self._type_verdicts: dict[str, TypeVerdict] = {}
+
+    @staticmethod
+    def _compile(patterns: list[str]) -> re.Pattern | None:
+        if patterns:
+            return re.compile("|".join(patterns), re.IGNORECASE)
+
+    @staticmethod
+    def _is_type_valid(type_re: re.Pattern | None, if_type: str) -> bool:
+        return type_re is None or type_re.search(if_type) is not None
+
+    @staticmethod
+    def _is_excluded(exclude_re: re.Pattern | None, *names: str) -> bool:
+        """Empty names are never excluded."""
+        if exclude_re is None:
+            return False
+        return any(name and exclude_re.search(name) for name in names)
+
+    def _get_type_verdict(self, if_type: str) -> TypeVerdict:
+        verdict = self._type_verdicts.get(if_type)
+        if verdict is None:
+            verdict = (
+                self._is_type_valid(self._port_channel_type_re, if_type),
+                self._is_type_valid(self._port_type_re, if_type),
+            )
+            self._type_verdicts[if_type] = verdict
+        return verdict
+
+    def _is_port_channel(self, if_name: str, if_descr_name: str) -> bool:
+        if self._is_excluded(self._port_channel_exclude_re, if_name, if_descr_name):
+            return False
+        name_re = self._port_channel_name_re
+        return (
+            name_re is None
+            or name_re.search(if_name) is not None
+            or name_re.search(if_descr_name) is not None
+        )
+
+    def _is_port(self, if_name: str, if_descr_name: str) -> bool:
+        if self._is_excluded(self._port_exclude_re, if_name, if_descr_name):
+            return False
+        name_re = self._port_name_re
+        return name_re is None or (
+            name_re.search(if_name) is None and name_re.search(if_descr_name) is None
+        )
+
+    def classify(self, if_name: str, if_descr_name: str, if_type: str) -> str:
+        is_channel_type, is_port_type = self._get_type_verdict(if_type)
+        if is_channel_type and self._is_port_channel(if_name, if_descr_name):
+            return PORT_CHANNEL
+        if is_port_type and self._is_port(if_name, if_descr_name):
+            return PORT
+        return EXCLUDED
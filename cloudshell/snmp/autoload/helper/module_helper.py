@@ -4,17 +4,24 @@ from cloudshell.snmp.autoload.exceptions.snmp_autoload_error import GeneralAutol
 
 
 class ModuleHelper:
-    def __init__(self, resource_model, physical_table_service, logger):
+    def __init__(self, resource_model, physical_table_service, logger, chassis=None):
+        """Init.
+
+        :param chassis: chassis the ports belong to, the first one if not set
+        """
         self._resource_model = resource_model
         self._physical_table_service = physical_table_service
         self._logger = logger
+        self._chassis = chassis
         self.port_id_to_module_map = {}
         self._module_parents_map = {}
         self._sub_module_parents_map = {}
         self.modules_list = []
 
     def get_parent_module(self, port_id, entity=None):
-        chassis = list(self._physical_table_service.physical_chassis_dict.values())[0]
+        chassis = self._chassis or next(
+            iter(self._physical_table_service.physical_chassis_dict.values())
+        )
         if not port_id and not entity:
             return chassis
         module_generated = False
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from cloudshell.snmp.autoload.helper.module_helper import ModuleHelper
 from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import BaseEntity
@@ -31,10 +31,8 @@ class PortHelper:
         self._port_table_service = port_table_service
         self._port_mapping_service = port_mapping_table_service
         self._resource_model = resource_model
-        self._module_helper = ModuleHelper(
-            resource_model, physical_table_service, logger
-        )
         self._logger = logger
+        self._module_helper = self._create_module_helper()
         self._identified_ports = []
 
     def build_ports_structure(self) -> None:
@@ -60,14 +58,50 @@ class PortHelper:
 
         self._logger.info("Building Ports completed")
 
+    def _create_module_helper(self, chassis=None) -> ModuleHelper:
+        return ModuleHelper(
+            self._resource_model, self._physical_table_service, self._logger, chassis
+        )
+
+    def _build_per_chassis(
+        self, items: list, get_phys_index: Callable, build: Callable
+    ) -> None:
+        """Build ports of every chassis with its own module helper.
+
+        Port ids of different chassis can't collide in the module helper maps.
+        Ports of unknown chassis are built afterwards with the shared module
+        helper.
+        """
+        if len(self._chassis) < 2:
+            self._identified_ports.extend(build(items, self._module_helper))
+            return
+
+        partitions = {chassis_index: [] for chassis_index in self._chassis}
+        partitions[None] = []
+        for item in items:
+            chassis_index = self._physical_table_service.get_chassis_index(
+                get_phys_index(item)
+            )
+            partitions[chassis_index].append(item)
+        unknown_chassis_items = partitions.pop(None)
+        for chassis_index, chassis_items in partitions.items():
+            if chassis_items:
+                module_helper = self._create_module_helper(self._chassis[chassis_index])
+                self._identified_ports.extend(build(chassis_items, module_helper))
+        self._identified_ports.extend(build(unknown_chassis_items, self._module_helper))
+
     def _load_ports_based_on_mapping(self):
-        for (
-            if_index,
-            phys_port_index,
-        ) in self._port_mapping_service.port_mapping.port_mapping_snmp_table.items():
-            phys_port = self._physical_table_service.physical_structure_table.get(
-                phys_port_index
-            )  # Port from resource_model based on Entity table
+        self._build_per_chassis(
+            list(
+                self._port_mapping_service.port_mapping.port_mapping_snmp_table.items()
+            ),
+            get_phys_index=lambda item: item[1],
+            build=self._load_mapped_ports,
+        )
+
+    def _load_mapped_ports(self, items, module_helper: ModuleHelper) -> list[str]:
+        identified_ports = []
+        for if_index, phys_port_index in items:
             phys_port_entity = self._physical_table_service.load_entity(
                 phys_port_index
             )  # BaseEntity used for mapping
@@ -81,8 +115,11 @@ class PortHelper:
                 # or not phys_port
                 or (phys_port_entity and not self._is_valid_port(phys_port_entity))
             ):
-                self._identified_ports.append(if_index)
+                identified_ports.append(if_index)
                 continue
+            phys_port = self._physical_table_service.get_resource(
+                phys_port_index
+            )  # Port from resource_model based on Entity table
             if not phys_port:
                 continue
 
@@ -94,14 +131,15 @@ class PortHelper:
 
             if len(port_ids.split("-")) > 3:
                 port_ids = port_ids[: port_ids.rfind("-")]
-            parent = self._module_helper.port_id_to_module_map.get(port_ids)
+            parent = module_helper.port_id_to_module_map.get(port_ids)
             if parent:
                 parent.connect_port(if_port)
-                self._identified_ports.append(if_index)
+                identified_ports.append(if_index)
                 continue
 
-            self._module_helper.attach_port_to_parent(phys_port, if_port, port_ids)
-            self._identified_ports.append(if_index)
+            module_helper.attach_port_to_parent(phys_port, if_port, port_ids)
+            identified_ports.append(if_index)
+        return identified_ports
 
     def _load_ports_from_if_table(self):
         for if_index, interface in self._port_table_service.ports_dict.items():
@@ -145,19 +183,25 @@ class PortHelper:
             self._identified_ports.append(if_index)
 
     def _load_ports_from_physical_table(self):
-        for phys_port_id in self._physical_table_service.physical_ports_list:
-            phys_port = self._physical_table_service.physical_structure_table.get(
-                phys_port_id
-            )
-            parent = self._module_helper.get_parent_module("", phys_port)
+        self._build_per_chassis(
+            self._physical_table_service.physical_ports_list,
+            get_phys_index=lambda item: item,
+            build=self._load_physical_ports,
+        )
+
+    def _load_physical_ports(self, items, module_helper: ModuleHelper) -> list[str]:
+        for phys_port_id in items:
+            phys_port = self._physical_table_service.get_resource(phys_port_id)
+            parent = module_helper.get_parent_module("", phys_port)
             if phys_port.name == "Port":
                 phys_port_entity = self._physical_table_service.load_entity(
                     phys_port_id
                 )
-                new_rel_path = self._module_helper.find_module_ids(parent)
+                new_rel_path = module_helper.find_module_ids(parent)
                 new_rel_path.append(phys_port_entity.position_id)
                 phys_port.name += "-".join(new_rel_path)
             parent.connect_port(phys_port)
+        return []
 
     def _is_valid_port(self, entity_port: BaseEntity):
         result = True
@@ -1,3 +1,19 @@
+from pysnmp.proto.errind import RequestTimedOut
+
+from cloudshell.snmp.core.domain.snmp_oid import SnmpMibObject
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
+
+# GET requests in flight at once, get_list sends a request per value
+GET_BATCH_SIZE = 60
+
+
+def if_index_sort_key(index: str):
+    """Numeric order of ifIndexes, non-numeric ones go last."""
+    if index.isdigit():
+        return 0, int(index)
+    return 1, index
+
+
 def log_autoload_details(logger, autoload_details):
     """Logging autoload details.
 
@@ -25,3 +41,43 @@ def log_autoload_details(logger, autoload_details):
             )
         )
     logger.debug("-------------------- </ATTRIBUTES> ---------------------")
+
+
+def get_rows_by_index(
+    snmp_service,
+    logger,
+    columns,
+    indexes,
+    batch_size=GET_BATCH_SIZE,
+    raise_errors=False,
+):
+    """GET columns of the table rows in batches instead of walking the table.
+
+    get_list sends a GET request per value and waits for all of them, so a
+    batch has as many rows as fit in batch_size requests. A batch costs a
+    round trip, an error of any of its requests loses the whole batch.
+
+    :param batch_size: GET requests in flight at once
+    :param raise_errors: raise the SNMP errors of a batch instead of logging
+        them and skipping its rows
+    :return: iterator over indexes of every batch and their responses
+    """
+    rows_per_batch = max(1, batch_size // max(1, len(columns)))
+    for start in range(0, len(indexes), rows_per_batch):
+        batch_indexes = indexes[start : start + rows_per_batch]
+        batch = [
+            SnmpMibObject(column.mib_name, column.object_name, index)
+            for index in batch_indexes
+            for column in columns
+        ]
+        try:
+            responses = snmp_service.get_list(batch)
+        except (RequestTimedOut, ReadSNMPException) as e:
+            if raise_errors:
+                raise
+            logger.error(
+                f"Error retrieving snmp response, {len(batch_indexes)} rows "
+                f"are skipped: {e}"
+            )
+            responses = []
+        yield batch_indexes, responses
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+
+class StringInternTable:
+    """Decoded SNMP values shared within a discovery.
+
+    safe_value builds a new string on every call, so the same model name or
+    interface type decoded for thousands of rows is kept in thousands of copies.
+    Only columns with repeated values are worth interning, unique ones like
+    names and serial numbers would just grow the table.
+    """
+
+    def __init__(self):
+        self._strings: dict[str, str] = {}
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, value: str | None) -> str | None:
+        if not value:
+            return value
+        return self._strings.setdefault(value, value)
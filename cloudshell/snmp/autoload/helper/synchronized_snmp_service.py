@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from functools import wraps
+from threading import RLock
+
+
+class SynchronizedSnmpService:
+    """SnmpService shared by the threads of a discovery.
+
+    SnmpService and the pysnmp dispatcher under it aren't thread-safe, every
+    request runs the dispatcher on the socket map of the same engine, so
+    concurrent requests lose each other's responses. Requests are sent one at
+    a time, threads still overlap their processing with requests of others.
+    """
+
+    def __init__(self, snmp_service):
+        self._snmp_service = snmp_service
+        self._lock = RLock()
+
+    @classmethod
+    def wrap(cls, snmp_service) -> SynchronizedSnmpService:
+        if isinstance(snmp_service, cls):
+            return snmp_service
+        return cls(snmp_service)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._snmp_service, name)
+        if not callable(attribute):
+            return attribute
+
+        @wraps(attribute)
+        def synchronized(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return synchronized
@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from logging import Logger
-from threading import Thread
+from threading import Lock, Thread, current_thread
 from typing import TYPE_CHECKING
 
+from cloudshell.snmp.autoload.constants.entity_constants import (
+    ENTITY_CLASS,
+    ENTITY_VENDOR_TYPE,
+)
 from cloudshell.snmp.autoload.exceptions.snmp_autoload_error import GeneralAutoloadError
+from cloudshell.snmp.autoload.helper.entity_containment_index import (
+    EntityContainmentIndex,
+)
 from cloudshell.snmp.autoload.helper.entity_helper import EntityHelper, EntityHelperAbc
 from cloudshell.snmp.autoload.helper.port_name_helper import convert_port_name
-from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import BaseEntity
+from cloudshell.snmp.autoload.helper.string_intern_table import StringInternTable
+from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import (
+    BaseEntity,
+    get_row_value,
+)
 from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
 
 if TYPE_CHECKING:
     from cloudshell.snmp.autoload.helper.types.resource_model import (
         ResourceModelChassisProto,
+        ResourceModelModuleProto,
         ResourceModelProto,
     )
 
@@ -22,6 +34,7 @@ if TYPE_CHECKING:
 
 
 class PhysicalTable:
+    ENTITY_EXCLUDE_CLASS_LIST = ["sensor", "fan", "cpu"]
     MODULE_EXCLUDE_LIST = ["fan", "cpu"]
     MODULE_TO_CONTAINER_LIST = []
     DUMMY_CHASSIS_ID = "0"
@@ -32,27 +45,46 @@ class PhysicalTable:
         logger: Logger,
         resource_model: ResourceModelProto,
         entity_helper: EntityHelperAbc = EntityHelper(),
+        intern_table: StringInternTable | None = None,
     ):
+        """Init.
+
+        :param intern_table: values shared within the discovery
+        """
         self.entity_table = entity_table
         self._logger = logger
         self._resource_model = resource_model
         self._physical_structure_table = {}
+        self._entities: dict[PhysId, BaseEntity] = {}
         self._module_exclude_pattern = None
         self.power_port_exclude_pattern = None
         self.chassis_exclude_pattern = None
         self._port_list = []
+        self._port_names: dict[PhysId, str] = {}
+        self._ports_created = False
         self._power_port_dict = {}
         self._chassis_dict = {}
+        self._chassis_keys: dict[tuple[str, str], PhysId] = {}
+        self._duplicate_chassis_dict: dict[PhysId, PhysId] = {}
         self.parent_dict = {}
         self.port_parent_dict = {}
         self._modules_hierarchy_dict = defaultdict(list)
         self.chassis_ids_dict = {}
+        self._containment_index = None
+        self._containment_index_pattern = None
+        self._containment_index_lock = Lock()
+        self._module_locations: dict[PhysId, tuple | None] = {}
+        self._module_locations_lock = Lock()
+        self._ingested_entities = []
+        self._port_name_index = None
         self._chassis_helper = entity_helper
-        self._snmp_physical_structure_table = (
-            self.entity_table.physical_structure_snmp_table
-        )
+        if intern_table is None:
+            intern_table = StringInternTable()
+        self._intern_table = intern_table
+        self._snmp_physical_structure_table = None
+        self._thread_error = None
         self._thread = Thread(
-            name=self.__class__.__name__, target=self._get_entity_table
+            name=self.__class__.__name__, target=self._load_entity_table
         )
         self._thread.start()
 
@@ -65,11 +97,49 @@ class PhysicalTable:
     @property
     def module_exclude_pattern(self):
         pattern = "|".join(self.MODULE_EXCLUDE_LIST)
-        return re.compile(pattern, re.IGNORECASE)
+        if (
+            not self._module_exclude_pattern
+            or self._module_exclude_pattern.pattern != pattern
+        ):
+            self._module_exclude_pattern = re.compile(pattern, re.IGNORECASE)
+        return self._module_exclude_pattern
+
+    @property
+    def containment_index(self) -> EntityContainmentIndex:
+        """Containment tree of the Entity-MIB with resolved ancestors.
+
+        Rebuilt only if MODULE_EXCLUDE_LIST was changed after it was built.
+        """
+        module_exclude_pattern = self.module_exclude_pattern
+        if self._containment_index is None and current_thread() is not self._thread:
+            # built while the Entity-MIB is being loaded
+            self._wait_for_entity_table()
+        with self._containment_index_lock:
+            if (
+                self._containment_index is None
+                or self._containment_index_pattern is not module_exclude_pattern
+            ):
+                self._containment_index = self._build_containment_index(
+                    self.snmp_physical_structure_table.items(), module_exclude_pattern
+                )
+                self._containment_index_pattern = module_exclude_pattern
+        return self._containment_index
+
+    @property
+    def snmp_physical_structure_table(self):
+        """Entity-MIB table, available once it's fully loaded."""
+        if self._snmp_physical_structure_table is None:
+            if current_thread() is not self._thread:
+                self._wait_for_entity_table()
+            if self._snmp_physical_structure_table is None:
+                self._snmp_physical_structure_table = (
+                    self.entity_table.physical_structure_snmp_table
+                )
+        return self._snmp_physical_structure_table
 
     @property
     def physical_ports_list(self):
-        self._thread.join()
+        self._wait_for_entity_table()
         return self._port_list
 
     @property
@@ -79,42 +149,177 @@ class PhysicalTable:
         :rtype: dict[PhysId,
         cloudshell.shell.standards.autoload_generic_models.AbstractResource]
         """
-        self._thread.join()
+        self._wait_for_entity_table()
         return self._power_port_dict
 
     @property
     def physical_chassis_dict(self) -> dict[PhysId, ResourceModelChassisProto]:
         """Chassis dict based on Entity-MIB."""
-        self._thread.join()
+        self._wait_for_entity_table()
         if not self._chassis_dict:
             self._add_dummy_chassis(self.DUMMY_CHASSIS_ID)
         return self._chassis_dict
 
+    @property
+    def duplicate_chassis_dict(self) -> dict[PhysId, PhysId]:
+        """Chassis entities skipped as duplicates of the discovered chassis.
+
+        Entity index of the duplicate to the index of the chassis
+        with the same serial number and model.
+        """
+        self._wait_for_entity_table()
+        return self._duplicate_chassis_dict
+
     @property
     def physical_structure_table(self):
         """Entities table based on Entity-MIB.
 
+        Creates resource model objects of all physical ports,
+        use get_resource to get only the needed ones.
+
         :rtype: dict[PhysId,
         cloudshell.shell.standards.autoload_generic_models.AbstractResource]
         """
-        self._thread.join()
+        self._wait_for_entity_table()
+        if not self._ports_created:
+            for entity_index in self._port_list:
+                self.get_resource(entity_index)
+            self._ports_created = True
         return self._physical_structure_table
 
+    def get_resource(self, entity_index):
+        """Resource model object of the entity.
+
+        Ports are kept as indexes with their names
+        until their resource model objects are needed.
+        """
+        self._wait_for_entity_table()
+        resource = self._physical_structure_table.get(entity_index)
+        if resource is None and entity_index in self._port_names:
+            resource = self._create_port(entity_index)
+        return resource
+
+    def get_port_name(self, entity_index) -> str | None:
+        """Name of the physical port picked from the Entity-MIB."""
+        self._wait_for_entity_table()
+        return self._port_names.get(entity_index)
+
+    def compact(self) -> None:
+        """Release Entity-MIB rows, discovered resources are already built."""
+        self._wait_for_entity_table()
+        self._entities = {}
+        self._snmp_physical_structure_table = {}
+
+    def _load_entity_table(self):
+        try:
+            self._get_entity_table()
+        except Exception as e:
+            self._thread_error = e
+
+    def _wait_for_entity_table(self):
+        """Wait until the Entity-MIB is loaded, raise the error of the load."""
+        self._thread.join()
+        if self._thread_error is not None:
+            raise self._thread_error
+
     def _get_entity_table(self):
         """Read Entity-MIB and filter out device's structure and all it's elements.
 
         Like ports, modules, chassis, etc.
-        :rtype: QualiMibTable
-        :return: structured and filtered EntityPhysical table.
+        Entities are ingested and classified while the rest of the Entity-MIB
+        is being loaded, ports need the whole table to pick unique names.
         """
-        for entity_index in self._snmp_physical_structure_table:
+        module_exclude_pattern = self.module_exclude_pattern
+        snapshot = self.entity_table.snapshot
+        ingestion = snapshot.ingestions.get(module_exclude_pattern.pattern)
+        if ingestion:
+            # entities of the previous discovery, ENTITY-MIB wasn't changed since,
+            # they are loaded from the decoded rows of the snapshot on demand
+            self._ingested_entities, containment_index = ingestion
+        else:
+            containment_index = self._build_containment_index(
+                self.entity_table.iter_physical_structure_snmp_table(),
+                module_exclude_pattern,
+            )
+            snapshot.ingestions[module_exclude_pattern.pattern] = (
+                self._ingested_entities,
+                containment_index,
+            )
+        self._snmp_physical_structure_table = (
+            self.entity_table.physical_structure_snmp_table
+        )
+        with self._containment_index_lock:
+            self._containment_index = containment_index
+            self._containment_index_pattern = module_exclude_pattern
+        _ = self.containment_index
+        for entity_index in self._ingested_entities:
             if entity_index in self._physical_structure_table:
                 continue
             self._add_entity(entity_index)
 
+    def _is_excluded_at_ingestion(self, entity_class: str, excluded: bool) -> bool:
+        entity_class = entity_class.strip("'").lower()
+        return entity_class in self.ENTITY_EXCLUDE_CLASS_LIST or (
+            entity_class == "module" and excluded
+        )
+
+    def _build_containment_index(self, entity_rows, module_exclude_pattern):
+        """Ingest Entity-MIB rows and build their containment tree.
+
+        Rows of ENTITY_EXCLUDE_CLASS_LIST classes and modules of
+        MODULE_EXCLUDE_LIST vendor types are dropped before any entity is built.
+        The dropped ones that contain other entities stay in the tree only
+        to keep the ancestry of the rest.
+        """
+        entity_kinds = {}
+        dropped_entity_kinds = {}
+        ingested_entities = []
+        rows_count = 0
+        for entity_index, entity_row in entity_rows:
+            rows_count += 1
+            if not entity_row:
+                continue
+            entity_class = get_row_value(entity_row, ENTITY_CLASS)
+            excluded = bool(
+                module_exclude_pattern.search(
+                    get_row_value(entity_row, ENTITY_VENDOR_TYPE)
+                )
+            )
+            if self._is_excluded_at_ingestion(entity_class, excluded):
+                dropped_entity_kinds[entity_index] = (entity_class, excluded)
+                continue
+            entity = self._entities.get(entity_index)
+            if entity is None:
+                entity = self._entities.setdefault(
+                    entity_index,
+                    BaseEntity(entity_index, entity_row, self._intern_table),
+                )
+            entity_kinds[entity_index] = (
+                self.chassis_helper.get_physical_class(entity),
+                excluded,
+            )
+            ingested_entities.append(entity_index)
+        self._ingested_entities = ingested_entities
+        self._logger.debug(
+            f"Ingested {len(ingested_entities)} out of {rows_count} entities"
+        )
+        parents = self.entity_table.physical_structure_table
+        for parent_index in set(parents.values()):
+            if parent_index in dropped_entity_kinds:
+                entity_kinds[parent_index] = dropped_entity_kinds[parent_index]
+        return EntityContainmentIndex(
+            {k: v for k, v in parents.items() if k in entity_kinds}, entity_kinds
+        )
+
     def load_entity(self, entity_index) -> BaseEntity:
-        entity_data = self.entity_table.physical_structure_snmp_table.get(entity_index)
-        return BaseEntity(entity_index, entity_data)
+        """Entity by entPhysicalIndex, the same object for the whole discovery."""
+        entity = self._entities.get(entity_index)
+        if entity is None:
+            entity_data = self.snmp_physical_structure_table.get(entity_index)
+            entity = self._entities.setdefault(
+                entity_index, BaseEntity(entity_index, entity_data, self._intern_table)
+            )
+        return entity
 
     def _add_entity(self, entity_index):
         if entity_index not in self.entity_table.physical_structure_table:
@@ -129,24 +334,22 @@ class PhysicalTable:
             self._add_chassis(entity)
 
     def _add_chassis(self, entity):
+        chassis_key = (entity.serial_number, entity.model)
+        duplicate_chassis_index = self._chassis_keys.get(chassis_key)
+        if duplicate_chassis_index is not None:
+            self._logger.debug(
+                f"Chassis {entity.index} is a duplicate of {duplicate_chassis_index}"
+            )
+            self._duplicate_chassis_dict[entity.index] = duplicate_chassis_index
+            return
+
         index = "0" if entity.position_id == "-1" else entity.position_id
         chassis_object = self._resource_model.entities.Chassis(index=index)
 
         chassis_object.model = entity.model
         chassis_object.serial_number = entity.serial_number
-        duplicate_chassis = next(
-            (
-                obj
-                for obj in self._chassis_dict.values()
-                if obj.serial_number == chassis_object.serial_number
-                and obj.model == chassis_object.model
-            ),
-            None,
-        )
-        if duplicate_chassis:
-            return
-
         self._logger.debug(f"Discovered a Chassis: {entity.model}")
+        self._chassis_keys[chassis_key] = entity.index
         self._chassis_dict[entity.index] = chassis_object
         self._physical_structure_table[entity.index] = chassis_object
         self.chassis_ids_dict[index] = chassis_object
@@ -156,37 +359,53 @@ class PhysicalTable:
         if not name:
             return
 
-        port_object = self._resource_model.entities.Port(index=entity.index, name=name)
         parent_module = self.find_parent_module(entity.index)
+        self._port_names[entity.index] = name
+        self._port_list.append(entity.index)
+        if parent_module:
+            self.port_parent_dict[entity.index] = parent_module.index
 
+    def _create_port(self, entity_index):
+        entity = self.load_entity(entity_index)
+        port_object = self._resource_model.entities.Port(
+            index=entity_index, name=self._port_names[entity_index]
+        )
         port_object.port_description = entity.description
+        port_object = self._physical_structure_table.setdefault(
+            entity_index, port_object
+        )
         self._logger.debug(f"Discovered a Port: {entity.model}")
-        self._physical_structure_table[entity.index] = port_object
-        self._port_list.append(entity.index)
-        if not parent_module:
-            return
-        self.parent_dict[port_object] = parent_module.index
+        parent_index = self.port_parent_dict.get(entity_index)
+        if parent_index:
+            self.parent_dict.setdefault(port_object, parent_index)
+        return port_object
+
+    @property
+    def port_name_index(self) -> dict[str, tuple[Counter, Counter]]:
+        """Converted entity names and descriptions counted per entity class."""
+        if self._port_name_index is None:
+            # entities dropped at ingestion never share a class with ports
+            _ = self.containment_index
+            port_name_index = defaultdict(lambda: (Counter(), Counter()))
+            for entity_index in self._ingested_entities:
+                entity = self.load_entity(entity_index)
+                names, descriptions = port_name_index[entity.entity_class]
+                names[convert_port_name(entity.name)] += 1
+                descriptions[convert_port_name(entity.description)] += 1
+            self._port_name_index = dict(port_name_index)
+        return self._port_name_index
 
     def _pick_port_name(self, entity):
         port_name = "Port"
-        name_is_unique = True
-        descr_is_unique = True
         ent_name = convert_port_name(entity.name)
         ent_desc = convert_port_name(entity.description)
-        for k in self.entity_table.physical_structure_snmp_table:
-            if k == entity.index:
-                continue
-            v_entity = self.load_entity(k)
-            if v_entity.entity_class == entity.entity_class:
-                if convert_port_name(v_entity.name) == ent_name:
-                    name_is_unique = False
-                if convert_port_name(v_entity.description) == ent_desc:
-                    descr_is_unique = False
-            if not descr_is_unique and not name_is_unique:
-                break
-        if name_is_unique:
+        names, descriptions = self.port_name_index.get(
+            entity.entity_class, (Counter(), Counter())
+        )
+        # the entity itself is counted in the index as well
+        if names[ent_name] <= 1:
             port_name = ent_name
-        elif descr_is_unique:
+        elif descriptions[ent_desc] <= 1:
             port_name = ent_desc
         return port_name
 
@@ -202,37 +421,42 @@ class PhysicalTable:
         self._power_port_dict[entity.index] = power_port_object
 
     def _find_parent_containers(self, entity_id):
-        parent_index = self.entity_table.physical_structure_table.get(entity_id)
-        parent = self.load_entity(parent_index)
-        if not parent.entity_row_response:
-            return
-        entity_class = self.chassis_helper.get_physical_class(parent)
-        if entity_class in ["container", "backplane"]:
-            return parent
-        elif (
-            self.module_exclude_pattern.search(parent.vendor_type)
-            or "port" in entity_class
-        ):
-            return self._find_parent_containers(parent_index)
+        parent_index = self.containment_index.get_parent_container(entity_id)
+        if parent_index:
+            return self.load_entity(parent_index)
 
     def find_parent_module(self, entity_id):
-        parent_index = self.entity_table.physical_structure_table.get(entity_id)
-        if not parent_index:
-            return
-        parent = self.load_entity(parent_index)
-        if not parent.entity_row_response:
+        parent_index = self.containment_index.get_parent_module(entity_id)
+        if parent_index:
+            return self.load_entity(parent_index)
+
+    def create_module(self, entity_index: str) -> ResourceModelModuleProto | None:
+        """New Module of the entity, ModuleHelper changes the modules it gets.
+
+        The entity and its position are resolved once per discovery.
+        """
+        location = self._module_locations.get(entity_index)
+        if location is None and entity_index not in self._module_locations:
+            with self._module_locations_lock:
+                if entity_index not in self._module_locations:
+                    self._module_locations[entity_index] = self._locate_module(
+                        entity_index
+                    )
+                location = self._module_locations[entity_index]
+        if location is None:
             return
-        entity_class = self.chassis_helper.get_physical_class(parent)
-        if "module" in entity_class and not self.module_exclude_pattern.search(
-            parent.vendor_type
-        ):
-            return parent
-        if "chassis" in entity_class:
-            return parent
-        else:
-            return self.find_parent_module(parent_index)
+        entity, position_id, parent_module_index = location
 
-    def create_module(self, entity_index: str):
+        module_object = self._resource_model.entities.Module(index=position_id)
+        module_object.model = entity.model
+        module_object.version = entity.os_version
+        module_object.serial_number = entity.serial_number
+        self._physical_structure_table[entity.index] = module_object
+        self._logger.debug(f"Discovered a Module: {entity.model}")
+        self.parent_dict[module_object] = parent_module_index
+        return module_object
+
+    def _locate_module(self, entity_index: str) -> tuple | None:
         entity = self.load_entity(entity_index)
         if not entity.entity_row_response:
             return
@@ -249,26 +473,19 @@ class PhysicalTable:
             parent_module_index = self.entity_table.physical_structure_table.get(
                 parent_container.index
             )
+        return entity, position_id, parent_module_index
 
-        module_object = self._resource_model.entities.Module(index=position_id)
-        module_object.model = entity.model
-        module_object.version = entity.os_version
-        module_object.serial_number = entity.serial_number
-        self._physical_structure_table[entity.index] = module_object
-        self._logger.debug(f"Discovered a Module: {entity.model}")
-        self.parent_dict[module_object] = parent_module_index
-        return module_object
+    def get_chassis_index(self, entity_id) -> PhysId | None:
+        """Index of the discovered chassis containing the entity."""
+        chassis_index = self.containment_index.get_parent_chassis(entity_id)
+        if chassis_index in self.physical_chassis_dict:
+            return chassis_index
 
     def get_parent_chassis(self, entity_id):
-        parent_index = self.entity_table.physical_structure_table.get(entity_id)
+        parent_index = self.containment_index.get_parent_chassis(entity_id)
         if not parent_index:
             raise GeneralAutoloadError("Error loading parent entity")
-        parent = self.load_entity(parent_index)
-        entity_class = self.chassis_helper.get_physical_class(parent)
-        if "chassis" in entity_class:
-            return parent
-        else:
-            return self.get_parent_chassis(parent_index)
+        return self.load_entity(parent_index)
 
     def _add_dummy_chassis(self, chassis_id):
         """Create Dummy Chassis."""
@@ -28,16 +28,17 @@ class PortMappingService:
         self._get_physical_ports()
 
     def _get_physical_ports(self):
+        """Index physical ports by names, ports are created only when mapped."""
         for port_id in self._physical_table.physical_ports_list:
-            port = self._physical_table.physical_structure_table.get(port_id)
-            if self._port_table.is_wrong_port(port.name) or (
-                port.port_description
-                and self._port_table.is_wrong_port(port.port_description)
+            port_name = self._physical_table.get_port_name(port_id)
+            port_description = self._physical_table.load_entity(port_id).description
+            if self._port_table.is_wrong_port(port_name) or (
+                port_description and self._port_table.is_wrong_port(port_description)
             ):
                 continue
-            self._physical_port_dict[port.name.lower()] = port
-            if port.port_description:
-                self._physical_port_dict[port.port_description.lower()] = port
+            self._physical_port_dict[port_name.lower()] = port_id
+            if port_description:
+                self._physical_port_dict[port_description.lower()] = port_id
 
     def get_mapping(self, port, if_descr):
         if_descr = if_descr.replace("/", "-")
@@ -59,10 +60,10 @@ class PortMappingService:
         :return: simple mapping from entPhysicalTable index to ifTable index:
         |        {entPhysicalTable index: ifTable index, ...}
         """
-        port = self._physical_port_dict.get(port_name.lower())
-        if port:
-            return port
-        for entity_name, port in self._physical_port_dict.items():
+        port_id = self._physical_port_dict.get(port_name.lower())
+        if port_id:
+            return self._physical_table.get_resource(port_id)
+        for entity_name, port_id in self._physical_port_dict.items():
             if_table_re = None
             port_if_match = self.PORT_NAME_PATTERN.search(entity_name)
             if not port_if_match:
@@ -75,8 +76,8 @@ class PortMappingService:
                 port_pattern = re.compile(
                     rf"^\S*\D*[^-]{if_table_re}(/\D+|$)", re.IGNORECASE
                 )
-                if port_pattern.search(port_name) and port:
-                    return port
+                if port_pattern.search(port_name) and port_id:
+                    return self._physical_table.get_resource(port_id)
 
     def _drop_mapped_port(self, port):
         if port and port.name.lower() in self._physical_port_dict:
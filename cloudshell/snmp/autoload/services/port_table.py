@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import re
-from functools import lru_cache
 from logging import Logger
 from typing import TYPE_CHECKING
 
+from cloudshell.snmp.autoload.helper.interface_classifier import (
+    EXCLUDED,
+    PORT,
+    PORT_CHANNEL,
+    InterfaceClassifier,
+)
 from cloudshell.snmp.autoload.helper.port_name_helper import convert_port_name
+from cloudshell.snmp.autoload.helper.snmp_autoload_helper import if_index_sort_key
+from cloudshell.snmp.autoload.helper.string_intern_table import StringInternTable
 from cloudshell.snmp.autoload.snmp.entities.snmp_if_entity import SnmpIfEntity
 from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
 
@@ -43,55 +50,65 @@ class PortsTable:
         resource_model: ResourceModelProto,
         ports_snmp_table: SnmpPortsTable,
         logger: Logger,
+        intern_table: StringInternTable | None = None,
     ):
+        """Init.
+
+        :param intern_table: values shared within the discovery
+        """
         self._resource_model = resource_model
         self._if_table = {}
         self._if_entity = SnmpIfEntity
+        self._if_entities: dict[str, SnmpIfEntity] = {}
         self._duplex_table = {}
         self._adjacent_table = {}
         self._auto_negotiation = {}
         self._if_port_dict: dict[str, ResourceModelPortProto] = {}
         self._if_port_channels_dict: dict[str, ResourceModelPortChanelProto] = {}
+        self._if_entities_loaded = False
         self.port_name_to_object_map = {}
         self._unmapped_ports_list = []
         self.ports_tables = ports_snmp_table
         self._logger = logger
+        self._patterns: dict[str, re.Pattern] = {}
+        self._classifier: InterfaceClassifier | None = None
+        self._classifier_lists: tuple | None = None
+        if intern_table is None:
+            intern_table = StringInternTable()
+        self._intern_table = intern_table
+
+    def _get_pattern(self, patterns: list[str]) -> re.Pattern:
+        """Compiled once per instance, recompiled if the list was changed."""
+        pattern = "|".join(patterns)
+        compiled_pattern = self._patterns.get(pattern)
+        if compiled_pattern is None:
+            compiled_pattern = re.compile(pattern, re.IGNORECASE)
+            self._patterns[pattern] = compiled_pattern
+        return compiled_pattern
 
     @property
-    @lru_cache()
     def port_exclude_re(self):
-        port_exclude = "|".join(self.PORT_EXCLUDE_LIST)
-        return re.compile(port_exclude, re.IGNORECASE)
+        return self._get_pattern(self.PORT_EXCLUDE_LIST)
 
     @property
-    @lru_cache()
     def port_channel_name_re(self):
-        port_channel_name = "|".join(self.PORT_CHANNEL_NAME_LIST)
-        return re.compile(port_channel_name, re.IGNORECASE)
+        return self._get_pattern(self.PORT_CHANNEL_NAME_LIST)
 
     @property
-    @lru_cache()
     def port_name_re(self):
-        port_name = "|".join(self.PORT_NAME_LIST)
-        return re.compile(port_name, re.IGNORECASE)
+        return self._get_pattern(self.PORT_NAME_LIST)
 
     @property
-    @lru_cache()
     def port_channel_exclude_re(self):
-        port_channel_exclude = "|".join(self.PORT_CHANNEL_EXCLUDE_LIST)
-        return re.compile(port_channel_exclude, re.IGNORECASE)
+        return self._get_pattern(self.PORT_CHANNEL_EXCLUDE_LIST)
 
     @property
-    @lru_cache()
     def port_valid_type_re(self):
-        port_valid = "|".join(self.PORT_VALID_TYPE_LIST)
-        return re.compile(port_valid, re.IGNORECASE)
+        return self._get_pattern(self.PORT_VALID_TYPE_LIST)
 
     @property
-    @lru_cache()
     def port_channel_valid_type_re(self):
-        port_channel_valid = "|".join(self.PORT_CHANNEL_VALID_TYPE_LIST)
-        return re.compile(port_channel_valid, re.IGNORECASE)
+        return self._get_pattern(self.PORT_CHANNEL_VALID_TYPE_LIST)
 
     @property
     def ports_dict(self):
@@ -102,9 +119,8 @@ class PortsTable:
         interface table and other tables. Including Physical structure table.
         :rtype: dict[str, cloudshell.shell.standards.autoload_generic_models.GenericPort]  # noqa: E501
         """
-        if not self._if_port_dict:
+        if not self._if_entities_loaded:
             self._get_if_entities()
-            self._if_port_dict = dict(sorted(self._if_port_dict.items()))
         return self._if_port_dict
 
     @property
@@ -115,19 +131,93 @@ class PortsTable:
         Usually, ifIndex is used by various vendors as a mapping key, between
         interface table and other tables.
         """
-        if not self._if_port_channels_dict:
+        if not self._if_entities_loaded:
             self._get_if_entities()
         return self._if_port_channels_dict
 
+    @property
+    def interface_classifier(self) -> InterfaceClassifier:
+        """Built once per instance, rebuilt if any of the lists was changed."""
+        lists = tuple(
+            tuple(x)
+            for x in (
+                self.PORT_CHANNEL_VALID_TYPE_LIST,
+                self.PORT_CHANNEL_NAME_LIST,
+                self.PORT_CHANNEL_EXCLUDE_LIST,
+                self.PORT_VALID_TYPE_LIST,
+                self.PORT_NAME_LIST,
+                self.PORT_EXCLUDE_LIST,
+            )
+        )
+        if lists != self._classifier_lists:
+            self._classifier = InterfaceClassifier(*lists)
+            self._classifier_lists = lists
+        return self._classifier
+
+    @property
+    def _has_custom_validation(self) -> bool:
+        cls = type(self)
+        return any(
+            getattr(cls, name) is not getattr(PortsTable, name)
+            for name in (
+                "_classify_port",
+                "_is_valid_port",
+                "_is_valid_port_channel",
+                "is_wrong_port",
+                "is_wrong_port_channel",
+                "port_exclude_re",
+                "port_name_re",
+                "port_valid_type_re",
+                "port_channel_exclude_re",
+                "port_channel_name_re",
+                "port_channel_valid_type_re",
+            )
+        )
+
     def _get_if_entities(self):
-        for port_index in self.ports_tables.port_table:
+        # ifTable is usually walked in ifIndex order already, so it's cheap
+        if_indexes = sorted(self.ports_tables.port_table, key=if_index_sort_key)
+        if self._has_custom_validation:
+            # custom validation can rely on any column of every interface
+            self.ports_tables.load_all_rows_details()
+            classify = self._classify_port
+        else:
+            classifier = self.interface_classifier
+
+            def classify(port: SnmpIfEntity) -> str:
+                return classifier.classify(
+                    port.if_name, port.if_descr_name, port.if_type
+                )
+
+        classified_ports = []
+        for port_index in if_indexes:
             port: SnmpIfEntity = self.load_if_port(port_index)
-            if self._is_valid_port_channel(port):
-                self._add_port_channel(port)
-                continue
+            port_class = classify(port)
+            if port_class != EXCLUDED:
+                classified_ports.append((port_class, port))
 
-            if self._is_valid_port(port):
+        port_indexes = [x.if_index for _, x in classified_ports]
+        # in selective mode only ports and port channels get the rest of columns
+        self.ports_tables.load_rows_details(port_indexes)
+        self.ports_tables.set_port_indexes(
+            port_indexes,
+            [x.if_index for x_class, x in classified_ports if x_class == PORT_CHANNEL],
+        )
+        for port_class, port in classified_ports:
+            if port_class == PORT_CHANNEL:
+                self._add_port_channel(port)
+            else:
                 self._add_port(port)
+        # devices without ports or port channels leave the dicts empty
+        self._if_entities_loaded = True
+
+    def _classify_port(self, port: SnmpIfEntity) -> str:
+        """Validation of subclasses overriding the _is_valid_* methods."""
+        if self._is_valid_port_channel(port):
+            return PORT_CHANNEL
+        if self._is_valid_port(port):
+            return PORT
+        return EXCLUDED
 
     def _is_valid_port(self, port: SnmpIfEntity):
         if self.PORT_VALID_TYPE_LIST:
@@ -167,50 +257,58 @@ class PortsTable:
         )
         port_object.mac_address = port.if_mac
         port_object.l2_protocol_type = port.if_type.replace("'", "")
-        port_object.ipv4_address = (
-            self.ports_tables.port_ip_table.get_all_ipv4_by_index(port.if_index)
-        )
-        port_object.ipv6_address = (
-            self.ports_tables.port_ip_table.get_all_ipv6_by_index(port.if_index)
-        )
         port_object.port_description = port.if_port_description
         port_object.bandwidth = port.if_speed
         port_object.mtu = port.if_mtu
-        port_object.duplex = self.ports_tables.port_duplex.get_duplex_by_port_index(
-            port.if_index
-        )
-        port_object.auto_negotiation = (
-            self.ports_tables.port_auto_neg.get_value_by_index(port.if_index)
-        )
-        port_object.adjacent = self.ports_tables.port_neighbors.get_adjacent_by_port(
-            port_object, port
+        attributes = self.ports_tables.get_port_attributes(port.if_index)
+        self._set_fetched_attributes(
+            port_object,
+            attributes,
+            ("ipv4_address", "ipv6_address", "duplex", "auto_negotiation"),
         )
+        if "adjacent" in self.ports_tables.port_fields:
+            port_object.adjacent = (
+                self.ports_tables.port_neighbors.get_adjacent_by_port(port_object, port)
+            )
+        for provider in self.ports_tables.registered_providers:
+            provider.set_port_attributes(port_object, port)
 
         self._if_port_dict[port.if_index] = port_object
 
+    def _set_fetched_attributes(self, resource, attributes, fields) -> None:
+        """Fields of the tables not fetched are left unset."""
+        port_fields = self.ports_tables.port_fields
+        for field in fields:
+            if field in port_fields:
+                setattr(resource, field, getattr(attributes, field))
+
     def load_if_port(self, index: str) -> SnmpIfEntity:
-        port_data = self.ports_tables.port_table.get(index)
-        return self._if_entity(index, port_data)
+        """Interface of the ifIndex, every row is loaded once per discovery."""
+        if_entity = self._if_entities.get(index)
+        if if_entity is None:
+            port_data = self.ports_tables.port_table.get(index)
+            if_entity = self._if_entity(
+                index, port_data, intern_table=self._intern_table
+            )
+            self._if_entities[index] = if_entity
+        return if_entity
+
+    def compact(self) -> None:
+        """Release loaded interfaces, discovered ports are already built."""
+        self._if_entities = {}
 
     def _add_port_channel(self, port: SnmpIfEntity):
         port_channel_object = self._resource_model.entities.PortChannel(
             index=port.port_id, name=convert_port_name(port.port_name)
         )
-        associated_port_list = (
-            self.ports_tables.port_channel_associated_ports.get_associated_ports(
-                port.if_index
-            )
-        )
-        if associated_port_list:
+        attributes = self.ports_tables.get_port_channel_attributes(port.if_index)
+        if attributes.associated_ports:
             port_channel_object.associated_ports = ", ".join(
-                [self._get_if_name_by_index(x) for x in associated_port_list]
+                [self._get_if_name_by_index(x) for x in attributes.associated_ports]
             )
         port_channel_object.port_description = port.if_port_description
-        port_channel_object.ipv4_address = (
-            self.ports_tables.port_ip_table.get_all_ipv4_by_index(port.if_index)
-        )
-        port_channel_object.ipv6_address = (
-            self.ports_tables.port_ip_table.get_all_ipv6_by_index(port.if_index)
+        self._set_fetched_attributes(
+            port_channel_object, attributes, ("ipv4_address", "ipv6_address")
         )
         self._if_port_channels_dict[port.if_index] = port_channel_object
 
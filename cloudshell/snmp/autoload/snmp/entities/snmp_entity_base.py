@@ -12,71 +12,129 @@ from cloudshell.snmp.autoload.constants.entity_constants import (
     ENTITY_SERIAL,
     ENTITY_VENDOR_TYPE,
 )
+from cloudshell.snmp.autoload.helper.string_intern_table import StringInternTable
+
+
+def get_row_value(entity_row_response, snmp_mib_object) -> str:
+    result = entity_row_response.get(snmp_mib_object.object_name)
+    return result.safe_value if result else ""
 
 
 class BaseEntity:
-    def __init__(self, index, entity_row_response):
+    """ENTITY-MIB row, every column is decoded on first access only.
+
+    Columns repeated across entities are interned if the intern table is set.
+    """
+
+    VENDOR_TYPE_LABEL_PATTERN = re.compile(r"^.+::")
+
+    __slots__ = (
+        "index",
+        "entity_row_response",
+        "_intern_table",
+        "_position_id",
+        "_os_version",
+        "_hw_version",
+        "_parent_id",
+        "_entity_class",
+        "_vendor_type",
+        "_vendor_type_label",
+        "_description",
+        "_name",
+        "_model",
+        "_serial_number",
+    )
+
+    def __init__(
+        self, index, entity_row_response, intern_table: StringInternTable = None
+    ):
         self.index = index
         self.entity_row_response = entity_row_response
+        self._intern_table = intern_table
+        self._position_id = None
+        self._os_version = None
+        self._hw_version = None
         self._parent_id = None
         self._entity_class = None
         self._vendor_type = None
+        self._vendor_type_label = None
         self._description = None
         self._name = None
         self._model = None
         self._serial_number = None
 
+    def _decode(self, snmp_mib_object) -> str:
+        return self._intern(get_row_value(self.entity_row_response, snmp_mib_object))
+
+    def _intern(self, value: str) -> str:
+        if self._intern_table is None:
+            return value
+        return self._intern_table.intern(value)
+
     @property
     def position_id(self):
-        result = self.entity_row_response.get(ENTITY_POSITION.object_name)
-        return result.safe_value if result else ""
+        if self._position_id is None:
+            self._position_id = self._decode(ENTITY_POSITION)
+        return self._position_id
 
     @property
     def os_version(self):
-        result = self.entity_row_response.get(ENTITY_OS_VERSION.object_name)
-        return result.safe_value if result else ""
+        if self._os_version is None:
+            self._os_version = self._decode(ENTITY_OS_VERSION)
+        return self._os_version
 
     @property
     def hw_version(self):
-        result = self.entity_row_response.get(ENTITY_HW_VERSION.object_name)
-        return result.safe_value if result else ""
+        if self._hw_version is None:
+            self._hw_version = self._decode(ENTITY_HW_VERSION)
+        return self._hw_version
 
     @property
     def description(self):
-        result = self.entity_row_response.get(ENTITY_DESCRIPTION.object_name)
-        return result.safe_value if result else ""
+        if self._description is None:
+            self._description = self._decode(ENTITY_DESCRIPTION)
+        return self._description
 
     @property
     def name(self):
-        result = self.entity_row_response.get(ENTITY_NAME.object_name)
-        return result.safe_value if result else ""
+        if self._name is None:
+            self._name = get_row_value(self.entity_row_response, ENTITY_NAME)
+        return self._name
 
     @property
     def parent_id(self):
-        result = self.entity_row_response.get(ENTITY_PARENT_ID.object_name)
-        return result.safe_value if result else ""
+        if self._parent_id is None:
+            self._parent_id = self._decode(ENTITY_PARENT_ID)
+        return self._parent_id
 
     @property
     def entity_class(self):
-        entity_class_response = self.entity_row_response.get(ENTITY_CLASS.object_name)
-        return entity_class_response.safe_value if entity_class_response else ""
+        if self._entity_class is None:
+            self._entity_class = self._decode(ENTITY_CLASS)
+        return self._entity_class
 
     @property
     def vendor_type(self):
-        result = self.entity_row_response.get(ENTITY_VENDOR_TYPE.object_name)
-        return result.safe_value if result else ""
+        if self._vendor_type is None:
+            self._vendor_type = self._decode(ENTITY_VENDOR_TYPE)
+        return self._vendor_type
 
     @property
     def vendor_type_label(self):
-        return re.sub(r"^.+::", "", self.vendor_type)
+        if self._vendor_type_label is None:
+            self._vendor_type_label = self._intern(
+                self.VENDOR_TYPE_LABEL_PATTERN.sub("", self.vendor_type)
+            )
+        return self._vendor_type_label
 
     @property
     def model(self):
-        result = self.entity_row_response.get(ENTITY_MODEL.object_name)
-        return result.safe_value if result else ""
+        if self._model is None:
+            self._model = self._decode(ENTITY_MODEL)
+        return self._model
 
     @property
     def serial_number(self):
-        result = self.entity_row_response.get(ENTITY_SERIAL.object_name)
-
-        return result.safe_value if result else ""
+        if self._serial_number is None:
+            self._serial_number = get_row_value(self.entity_row_response, ENTITY_SERIAL)
+        return self._serial_number
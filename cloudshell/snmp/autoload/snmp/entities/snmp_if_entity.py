@@ -1,5 +1,4 @@
 import re
-from functools import lru_cache
 
 from cloudshell.snmp.autoload.constants.port_constants import (
     PORT_DESCR_NAME,
@@ -10,69 +9,120 @@ from cloudshell.snmp.autoload.constants.port_constants import (
     PORT_SPEED,
     PORT_TYPE,
 )
+from cloudshell.snmp.autoload.helper.string_intern_table import StringInternTable
+
+NOT_DECODED = object()
 
 
 class SnmpIfEntity:
+    """IF-MIB row, every column is decoded on first access only.
+
+    Some columns are legitimately None, so a sentinel marks the ones not
+    decoded yet.
+    """
+
     PORT_IDS_PATTERN = re.compile(r"\d+(/\d+)*(\D\d+)*$", re.IGNORECASE)
 
-    def __init__(self, port_index, port_row):
+    __slots__ = (
+        "if_index",
+        "_if_table_row",
+        "_intern_table",
+        "_port_name",
+        "_if_name",
+        "_if_descr_name",
+        "_if_port_description",
+        "_if_type",
+        "_port_id",
+        "_if_speed",
+        "_if_mtu",
+        "_if_mac",
+    )
+
+    def __init__(self, port_index, port_row, intern_table: StringInternTable = None):
+        """Init.
+
+        :param intern_table: shares values repeated across interfaces,
+            like types, speeds and MTUs
+        """
         self.if_index = port_index
         self._if_table_row = port_row
+        self._intern_table = intern_table
+        self._port_name = NOT_DECODED
+        self._if_name = NOT_DECODED
+        self._if_descr_name = NOT_DECODED
+        self._if_port_description = NOT_DECODED
+        self._if_type = NOT_DECODED
+        self._port_id = NOT_DECODED
+        self._if_speed = NOT_DECODED
+        self._if_mtu = NOT_DECODED
+        self._if_mac = NOT_DECODED
+
+    def _intern(self, value):
+        if self._intern_table is None:
+            return value
+        return self._intern_table.intern(value)
+
+    def _get_value(self, snmp_mib_object):
+        result = self._if_table_row.get(snmp_mib_object.object_name)
+        if result:
+            return result.safe_value
 
     @property
-    @lru_cache()
     def port_name(self):
-        result = self.if_name or self.if_descr_name
-        return result.replace("/", "-").replace(":", "_")
+        if self._port_name is NOT_DECODED:
+            result = self.if_name or self.if_descr_name
+            self._port_name = result.replace("/", "-").replace(":", "_")
+        return self._port_name
 
     @property
-    @lru_cache()
     def if_name(self):
-        result = self._if_table_row.get(PORT_NAME.object_name)
-        return result.safe_value if result else ""
+        if self._if_name is NOT_DECODED:
+            self._if_name = self._get_value(PORT_NAME) or ""
+        return self._if_name
 
     @property
     def if_descr_name(self):
-        result = self._if_table_row.get(PORT_DESCR_NAME.object_name)
-        return result.safe_value if result else ""
+        if self._if_descr_name is NOT_DECODED:
+            self._if_descr_name = self._get_value(PORT_DESCR_NAME) or ""
+        return self._if_descr_name
 
     @property
     def if_port_description(self):
-        result = self._if_table_row.get(PORT_DESCRIPTION.object_name)
-        if result:
-            return result.safe_value
+        if self._if_port_description is NOT_DECODED:
+            self._if_port_description = self._intern(self._get_value(PORT_DESCRIPTION))
+        return self._if_port_description
 
     @property
     def if_type(self):
-        if_type = self._if_table_row.get(PORT_TYPE.object_name)
-        result = "other"
-        if if_type:
-            result = if_type.safe_value.strip("'")
-        return result
+        if self._if_type is NOT_DECODED:
+            if_type = self._get_value(PORT_TYPE)
+            result = "other"
+            if if_type is not None:
+                result = self._intern(if_type.strip("'"))
+            self._if_type = result
+        return self._if_type
 
     @property
-    @lru_cache()
     def port_id(self):
-        port_id = self.PORT_IDS_PATTERN.search(self.port_name)
-        if port_id:
-            return port_id.group().replace("/", "-")
+        if self._port_id is NOT_DECODED:
+            port_id = self.PORT_IDS_PATTERN.search(self.port_name)
+            self._port_id = port_id.group().replace("/", "-") if port_id else None
+        return self._port_id
 
     @property
-    @lru_cache()
     def if_speed(self):
-        result = self._if_table_row.get(PORT_SPEED.object_name)
-        return result.safe_value if result else ""
+        if self._if_speed is NOT_DECODED:
+            self._if_speed = self._intern(self._get_value(PORT_SPEED) or "")
+        return self._if_speed
 
     @property
-    @lru_cache()
     def if_mtu(self):
-        result = self._if_table_row.get(PORT_MTU.object_name)
-        if result:
-            return result.safe_value
+        if self._if_mtu is NOT_DECODED:
+            self._if_mtu = self._intern(self._get_value(PORT_MTU))
+        return self._if_mtu
 
     @property
-    @lru_cache()
     def if_mac(self):
-        result = self._if_table_row.get(PORT_MAC.object_name)
-        if result:
-            return result.safe_value
+        if self._if_mac is NOT_DECODED:
+            self._if_mac = self._get_value(PORT_MAC)
+        return self._if_mac
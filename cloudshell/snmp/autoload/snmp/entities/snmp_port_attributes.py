@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+
+class SnmpPortAttributes:
+    """Attributes of an interface joined from the port attribute tables.
+
+    IP-MIB addresses, EtherLike-MIB duplex, MAU-MIB auto negotiation and
+    IEEE8023-LAG-MIB members of a port channel. Attributes of the tables not
+    fetched by the discovery profile are None.
+    """
+
+    __slots__ = (
+        "if_index",
+        "ipv4_address",
+        "ipv6_address",
+        "duplex",
+        "auto_negotiation",
+        "associated_ports",
+    )
+
+    def __init__(
+        self,
+        if_index: str,
+        ipv4_address: str | None = None,
+        ipv6_address: str | None = None,
+        duplex: str | None = None,
+        auto_negotiation: str | None = None,
+        associated_ports: list[str] | None = None,
+    ):
+        self.if_index = if_index
+        self.ipv4_address = ipv4_address
+        self.ipv6_address = ipv6_address
+        self.duplex = duplex
+        self.auto_negotiation = auto_negotiation
+        self.associated_ports = associated_ports
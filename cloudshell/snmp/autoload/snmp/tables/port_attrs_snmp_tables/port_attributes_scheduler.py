@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from contextlib import suppress
+from logging import Logger
+from threading import Lock, Thread
+
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_interface import (  # noqa: E501
+    PortAttributesServiceInterface,
+)
+
+
+class PortAttributesScheduler:
+    """Loads SNMP tables of port attribute providers concurrently.
+
+    Every provider is loaded once in a thread of its own, so the discovery
+    goes on while the tables are requested. The SNMP service is shared, its
+    requests are sent one at a time, see SynchronizedSnmpService. Errors of
+    a load are raised to the one waiting for the provider.
+    """
+
+    def __init__(self, logger: Logger):
+        self._logger = logger
+        self._threads: dict[PortAttributesServiceInterface, Thread] = {}
+        self._errors: dict[PortAttributesServiceInterface, Exception] = {}
+        self._lock = Lock()
+
+    def start(self, providers: list[PortAttributesServiceInterface]) -> None:
+        """Start loading of the providers not started yet."""
+        with self._lock:
+            for provider in providers:
+                if provider in self._threads:
+                    continue
+                self._logger.debug(
+                    f"Loading {type(provider).__name__}: "
+                    f"{', '.join(x.object_name for x in provider.MIB_OBJECTS)}"
+                )
+                thread = Thread(
+                    target=self._load,
+                    args=(provider,),
+                    name=f"{type(provider).__name__} loader",
+                )
+                thread.start()
+                self._threads[provider] = thread
+
+    def _load(self, provider: PortAttributesServiceInterface) -> None:
+        try:
+            provider.load_snmp_table()
+        except Exception as e:
+            self._errors[provider] = e
+
+    def wait(self, provider: PortAttributesServiceInterface) -> None:
+        """Wait until the provider is loaded, start it if it wasn't started."""
+        self.start([provider])
+        self._threads[provider].join()
+        error = self._errors.get(provider)
+        if error:
+            raise error
+
+    def wait_all(self) -> None:
+        """Wait until every started provider is loaded, errors are logged."""
+        with self._lock:
+            threads = list(self._threads.items())
+        for provider, thread in threads:
+            thread.join()
+            error = self._errors.get(provider)
+            if error:
+                self._logger.warning(
+                    f"Failed to load {type(provider).__name__}: {error}"
+                )
+
+    def finalize_threads(self) -> None:
+        with suppress(Exception):
+            [thread.join(0) for thread in self._threads.values()]
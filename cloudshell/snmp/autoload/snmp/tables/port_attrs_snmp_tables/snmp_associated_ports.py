@@ -11,6 +11,12 @@ from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_in
 
 
 class PortChannelsAssociatedPorts(PortAttributesServiceInterface):
+    """Members of port channels, filled by the PortsTable as it knows their names."""
+
+    MIB_OBJECTS = [port_constants.PORT_CHANNEL_TABLE]
+    PORT_FIELDS = ("associated_ports",)
+    LOAD_BY_IF_INDEX = True
+
     def __init__(self, snmp_service: SnmpService, logger: Logger):
         super().__init__(snmp_service, logger)
         self._snmp_service = snmp_service
@@ -19,9 +25,15 @@ class PortChannelsAssociatedPorts(PortAttributesServiceInterface):
         self._snmp_associated_ports = {}
 
     def load_snmp_table(self):
-        self._snmp_associated_ports = self._snmp_service.get_table(
-            port_constants.PORT_CHANNEL_TABLE
-        )
+        # dot3adAggPortIndex is the ifIndex of the member port
+        table = None
+        if self._use_get_requests(1):
+            table = self._get_rows_by_index(
+                [port_constants.PORT_CHANNEL_TABLE], self._if_indexes
+            )
+        if table is None:
+            table = self._snmp_service.get_table(port_constants.PORT_CHANNEL_TABLE)
+        self._snmp_associated_ports = table
         if self._snmp_associated_ports:
             thread = Thread(
                 target=self._convert_associated_ports, name="Associated ports converter"
@@ -36,6 +48,9 @@ class PortChannelsAssociatedPorts(PortAttributesServiceInterface):
             if port_channel_id and port_channel_id.safe_value:
                 self._associated_ports[port_channel_id.safe_value].append(index)
 
+    def _release_snmp_table(self):
+        self._snmp_associated_ports = {}
+
     def get_associated_ports(self, port_index):
-        [thread.join() for thread in self._thread_list]
+        self._wait_for_conversion()
         return self._associated_ports.get(port_index)
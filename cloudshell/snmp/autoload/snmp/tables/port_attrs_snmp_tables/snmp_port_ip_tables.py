@@ -15,6 +15,13 @@ from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_in
 
 
 class PortIPTables(PortAttributesServiceInterface):
+    MIB_OBJECTS = [
+        port_constants.PORT_OLD_IP_INDEXES,
+        port_constants.PORT_MIXED_IP_INDEXES,
+        port_constants.PORT_MIXED_IPV6_INDEXES,
+    ]
+    PORT_FIELDS = ("ipv4_address", "ipv6_address")
+
     def __init__(self, snmp_service: SnmpService, logger: Logger):
         super().__init__(snmp_service, logger)
         self._snmp = snmp_service
@@ -99,7 +106,12 @@ class PortIPTables(PortAttributesServiceInterface):
                 ipv6_address = ipv6.index.replace(f"{port_index}.", "")
                 self._ipv6_table[port_index].add(ipv6_address)
 
-    def set_port_attributes(self, port_object):
+    def _release_snmp_table(self):
+        self._ipv4_snmp_table = {}
+        self._ip_mixed_snmp_table = {}
+        self._ipv6_snmp_table = {}
+
+    def set_port_attributes(self, port_object, port=None):
         port_object.ipv4_address = self.get_all_ipv4_by_index(
             port_object.relative_address.native_index
         )
@@ -108,13 +120,13 @@ class PortIPTables(PortAttributesServiceInterface):
         )
 
     def get_all_ipv4_by_index(self, port_index: str) -> str | None:
-        [thread.join() for thread in self._thread_list]
+        self._wait_for_conversion()
         ip_addresses = self._ipv4_table.get(port_index)
         if ip_addresses:
             return ", ".join(ip_addresses)
 
     def get_all_ipv6_by_index(self, port_index: str) -> str | None:
-        [thread.join() for thread in self._thread_list]
+        self._wait_for_conversion()
         ip_addresses = self._ipv6_table.get(port_index)
         if ip_addresses:
             return ", ".join(ip_addresses)
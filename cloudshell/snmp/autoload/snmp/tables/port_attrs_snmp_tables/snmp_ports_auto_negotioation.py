@@ -12,6 +12,13 @@ from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_in
 
 
 class PortAutoNegotiation(PortAttributesServiceInterface):
+    MIB_OBJECTS = [port_constants.PORT_AUTO_NEG]
+    PORT_FIELDS = ("auto_negotiation",)
+    LOAD_BY_IF_INDEX = True
+    # ifMauIndex requested with GET, the table is walked if any interface
+    # has no MAU of this index
+    MAU_INDEX = "1"
+
     def __init__(self, snmp_service: SnmpService, logger: Logger):
         super().__init__(snmp_service, logger)
         self._snmp = snmp_service
@@ -21,7 +28,18 @@ class PortAutoNegotiation(PortAttributesServiceInterface):
 
     def load_snmp_table(self):
         try:
-            table = self._snmp.get_table(port_constants.PORT_AUTO_NEG)
+            table = None
+            if self._use_get_requests(1):
+                indexes = [f"{x}.{self.MAU_INDEX}" for x in self._if_indexes]
+                table = self._get_rows_by_index([port_constants.PORT_AUTO_NEG], indexes)
+                if table is not None and not all(x in table for x in indexes):
+                    self._logger.info(
+                        f"Not every interface has MAU {self.MAU_INDEX}, walking "
+                        f"{port_constants.PORT_AUTO_NEG} table"
+                    )
+                    table = None
+            if table is None:
+                table = self._snmp.get_table(port_constants.PORT_AUTO_NEG)
         except RequestTimedOut:
             self._logger.error(f"Failed to load {port_constants.PORT_AUTO_NEG} table")
             table = {}
@@ -39,8 +57,14 @@ class PortAutoNegotiation(PortAttributesServiceInterface):
             for k, v in self._snmp_auto_negotiation.items()
         }
 
+    def set_port_attributes(self, port_object, port) -> None:
+        port_object.auto_negotiation = self.get_value_by_index(port.if_index)
+
+    def _release_snmp_table(self):
+        self._snmp_auto_negotiation = {}
+
     def get_value_by_index(self, index):
-        [thread.join() for thread in self._thread_list]
+        self._wait_for_conversion()
         response = "False"
         auto_neg_data = self._auto_negotiation.get(index)
         if auto_neg_data and "enabled" in auto_neg_data.safe_value.lower():
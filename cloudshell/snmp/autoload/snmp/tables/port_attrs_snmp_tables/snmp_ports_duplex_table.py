@@ -14,6 +14,10 @@ from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_in
 
 
 class PortDuplex(PortAttributesServiceInterface):
+    MIB_OBJECTS = port_constants.PORT_DUPLEX_TABLE
+    PORT_FIELDS = ("duplex",)
+    LOAD_BY_IF_INDEX = True
+
     def __init__(self, snmp_service: SnmpService, logger: Logger):
         super().__init__(snmp_service, logger)
         self._snmp = snmp_service
@@ -22,9 +26,15 @@ class PortDuplex(PortAttributesServiceInterface):
         self._duplex_snmp_table: dict[str, dict[SnmpMibObject, SnmpResponse]] = {}
 
     def load_snmp_table(self):
-        self._duplex_snmp_table = self._snmp.get_multiple_columns(
-            port_constants.PORT_DUPLEX_TABLE
-        )
+        # dot3StatsIndex is the ifIndex of the interface
+        table = None
+        if self._use_get_requests(len(port_constants.PORT_DUPLEX_TABLE)):
+            table = self._get_rows_by_index(
+                port_constants.PORT_DUPLEX_TABLE, self._if_indexes
+            )
+        if table is None:
+            table = self._snmp.get_multiple_columns(port_constants.PORT_DUPLEX_TABLE)
+        self._duplex_snmp_table = table
         if self._duplex_snmp_table:
             thread = Thread(target=self._convert_duplex_table, name="Duplex converter")
             thread.start()
@@ -40,6 +50,12 @@ class PortDuplex(PortAttributesServiceInterface):
             if port_duplex and "full" in port_duplex.safe_value.lower():
                 self._duplex_table[port_index.safe_value] = "Full"
 
+    def set_port_attributes(self, port_object, port) -> None:
+        port_object.duplex = self.get_duplex_by_port_index(port.if_index)
+
+    def _release_snmp_table(self):
+        self._duplex_snmp_table = {}
+
     def get_duplex_by_port_index(self, port_index: str) -> str | None:
-        [thread.join() for thread in self._thread_list]
+        self._wait_for_conversion()
         return self._duplex_table.get(port_index)
@@ -12,6 +12,10 @@ from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_in
 
 
 class PortNeighbours(PortAttributesServiceInterface):
+    MIB_OBJECTS = (
+        port_constants.PORT_LLDP_LOC_TABLE + port_constants.PORT_LLDP_REM_TABLE
+    )
+    PORT_FIELDS = ("adjacent",)
     ADJACENT_TEMPLATE = "{remote_host} through {remote_port}"
     LLDP_INDEX_PATTERN = re.compile(r"\.\d+\.")
     LLDP_LOC_INTERFACE_NAME = "interfacename"
@@ -86,6 +90,10 @@ class PortNeighbours(PortAttributesServiceInterface):
                     subtype = loc_subtype.safe_value.lower().strip("'")
                     self._adjacent_table[subtype].update(loc_dict)
 
+    def _release_snmp_table(self):
+        self._lldp_loc_snmp_table = {}
+        self._lldp_rem_snmp_table = {}
+
     def set_port_attributes(self, port_object, port):
         port_object.adjacent = self.get_adjacent_by_port(
             port=port, port_object=port_object
@@ -98,7 +106,7 @@ class PortNeighbours(PortAttributesServiceInterface):
         :return: device's name and port connected to port id
         :rtype string
         """
-        [thread.join() for thread in self._thread_list]
+        self._wait_for_conversion()
         if self.LLDP_LOC_INTERFACE_NAME in self._adjacent_table:
             return self._get_adjacent_by_port_name(port)
         elif self.LLDP_LOC_NETWORK_ADDR in self._adjacent_table:
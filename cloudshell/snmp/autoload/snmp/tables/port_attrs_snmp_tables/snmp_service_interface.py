@@ -1,17 +1,127 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from contextlib import suppress
+from math import ceil
+from typing import TYPE_CHECKING
+
+from pysnmp.proto.errind import RequestTimedOut
+
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
+
+from cloudshell.snmp.autoload.helper.snmp_autoload_helper import (
+    GET_BATCH_SIZE,
+    get_rows_by_index,
+)
+
+if TYPE_CHECKING:
+    from cloudshell.snmp.core.domain.snmp_oid import SnmpMibObject
 
 
 class PortAttributesServiceInterface(ABC):
+    """Provider of port attributes loaded from its own SNMP tables.
+
+    Providers declare MIB objects they load and port attributes they fill,
+    vendor shells add their own ones to the SnmpPortsTable.
+    """
+
+    MIB_OBJECTS: list[SnmpMibObject] = []
+    PORT_FIELDS: tuple[str, ...] = ()
+    # the table can be loaded with GET requests for known ifIndexes
+    LOAD_BY_IF_INDEX = False
+    GET_BATCH_SIZE = GET_BATCH_SIZE  # GET requests in flight at once
+    WALK_ROWS_PER_REQUEST = 25  # rows of a column per GETBULK of a walk
+
     def __init__(self, snmp_service, logger):
         self._snmp_service = snmp_service
         self._logger = logger
         self._thread_list = []
+        self._if_indexes = None
+        self._estimated_rows = 0
+
+    def set_if_indexes(self, if_indexes, estimated_rows: int) -> None:
+        """Interfaces the attributes are needed for.
+
+        Tables indexed by ifIndex GET only their rows if that takes fewer
+        requests than walking the table. Has to be set before the table is
+        loaded.
+
+        :param estimated_rows: rows expected in the table, usually the number
+            of interfaces of the device
+        """
+        self._if_indexes = list(if_indexes)
+        self._estimated_rows = estimated_rows
+
+    def _use_get_requests(self, columns_count: int) -> bool:
+        """Every value is a GET request of its own, a walk reads many per GETBULK."""
+        if self._if_indexes is None:
+            return False
+        get_requests = len(self._if_indexes) * columns_count
+        walk_requests = columns_count * ceil(
+            self._estimated_rows / self.WALK_ROWS_PER_REQUEST
+        )
+        use_get_requests = get_requests < walk_requests
+        if use_get_requests:
+            self._logger.info(
+                f"{type(self).__name__}: GET rows of {len(self._if_indexes)} "
+                f"interfaces with ~{get_requests} requests instead of walking "
+                f"~{self._estimated_rows} rows with ~{walk_requests} requests"
+            )
+        else:
+            self._logger.info(
+                f"{type(self).__name__}: walking ~{self._estimated_rows} rows "
+                f"with ~{walk_requests} requests instead of GET rows of "
+                f"{len(self._if_indexes)} interfaces with ~{get_requests} requests"
+            )
+        return use_get_requests
+
+    def _get_rows_by_index(self, columns, indexes) -> dict[str, dict] | None:
+        """Rows in the format of a walked table.
+
+        Agents can fail GET requests of a table they walk fine, with genErr or
+        tooBig for example, None is returned then and the table is to be walked.
+        """
+        table = {}
+        try:
+            for _, responses in get_rows_by_index(
+                self._snmp_service,
+                self._logger,
+                columns,
+                indexes,
+                self.GET_BATCH_SIZE,
+                raise_errors=True,
+            ):
+                for response in responses:
+                    table.setdefault(response.index, {})[response.mib_id] = response
+        except (RequestTimedOut, ReadSNMPException) as e:
+            self._logger.warning(
+                f"{type(self).__name__}: failed to GET rows, walking the table: {e}"
+            )
+            return None
+        return table
 
     @abstractmethod
     def load_snmp_table(self):
         pass
 
+    def set_port_attributes(self, port_object, port) -> None:
+        """Fill PORT_FIELDS of the Port built from the IF-MIB interface."""
+        pass
+
+    def compact(self):
+        """Release the loaded SNMP table once it's converted."""
+        self._wait_for_conversion()
+        self._release_snmp_table()
+
+    def _wait_for_conversion(self):
+        """Join converter threads once, lookups after that are dict reads."""
+        if self._thread_list:
+            [thread.join() for thread in self._thread_list]
+            self._thread_list = []
+
+    def _release_snmp_table(self):
+        pass
+
     def finalize_thread(self):
         with suppress(Exception):
             [thread.join(0) for thread in self._thread_list]
@@ -1,43 +1,286 @@
-from functools import lru_cache
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from threading import Lock
+
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
 
 from cloudshell.snmp.autoload.constants.entity_constants import (
+    ENTITY_LAST_CHANGE_TIME,
     ENTITY_PARENT_ID,
+    ENTITY_TABLE_CLASSIFICATION_COLUMNS,
+    ENTITY_TABLE_DETAILS_COLUMNS,
     ENTITY_TABLE_REQUIRED_COLUMNS,
     ENTITY_TO_IF_ID,
+    ENTITY_VALID_CLASS_PATTERN,
+)
+from cloudshell.snmp.autoload.constants.snmpv_v2_constants import SYS_UP_TIME
+from cloudshell.snmp.autoload.exceptions.snmp_autoload_error import GeneralAutoloadError
+from cloudshell.snmp.autoload.helper.entity_helper import EntityHelper
+from cloudshell.snmp.autoload.helper.entity_snapshot_cache import EntitySnapshot
+from cloudshell.snmp.autoload.helper.snmp_autoload_helper import (
+    GET_BATCH_SIZE,
+    get_rows_by_index,
 )
+from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import BaseEntity
 
 
 class SnmpEntityTable:
-    def __init__(self, snmp_handler, logger):
+    GET_BATCH_SIZE = GET_BATCH_SIZE  # GET requests in flight in selective mode
+    TABLE_NAME = "entPhysicalTable"
+
+    def __init__(
+        self, snmp_handler, logger, selective_retrieval=False, root_index=None
+    ):
+        """Init.
+
+        :param selective_retrieval: walk only the columns needed to classify
+            entities and GET the rest only for chassis, modules, ports, power
+            supplies and their containers
+        :param root_index: load only the entity with this entPhysicalIndex,
+            entities contained in it and its ancestors
+        """
         self._snmp_service = snmp_handler
         self._logger = logger
+        self._selective_retrieval = selective_retrieval
+        self.root_index = root_index
+        self._subtree_indexes = None
+        self._entity_helper = EntityHelper()
+        self._snapshot = EntitySnapshot()
+        self._physical_structure_snmp_table_lock = Lock()
+        # table, rows loaded so far and the generator loading the rest
+        self._loading: tuple | None = None
+
+    @property
+    def snapshot(self) -> EntitySnapshot:
+        """ENTITY-MIB data loaded so far."""
+        return self._snapshot
+
+    def restore_snapshot(self, snapshot: EntitySnapshot) -> None:
+        """Use ENTITY-MIB data of a previous discovery instead of loading it."""
+        self._snapshot = snapshot
+
+    def compact(self) -> None:
+        """Release the loaded ENTITY-MIB once the discovery is finished.
+
+        A snapshot kept by the EntitySnapshotCache stays intact.
+        """
+        with self._physical_structure_snmp_table_lock:
+            snapshot = EntitySnapshot()
+            snapshot.last_change_time = self._snapshot.last_change_time
+            snapshot.boot_time = self._snapshot.boot_time
+            snapshot.physical_structure_snmp_table = QualiMibTable(self.TABLE_NAME)
+            snapshot.physical_structure_table = {}
+            snapshot.port_mapping_snmp_table = {}
+            self._snapshot = snapshot
+            self._loading = None
+
+    @property
+    def last_change_time(self) -> str:
+        """entLastChangeTime, empty if the device doesn't support it."""
+        if self._snapshot.last_change_time is None:
+            self._snapshot.last_change_time = self._snmp_service.get_property(
+                ENTITY_LAST_CHANGE_TIME
+            ).safe_value
+        return self._snapshot.last_change_time
 
     @property
-    @lru_cache()
-    def physical_structure_snmp_table(self):
-        return self._snmp_service.get_multiple_columns(ENTITY_TABLE_REQUIRED_COLUMNS)
+    def boot_time(self) -> float | None:
+        """time.time() of the device boot estimated from sysUpTime."""
+        if self._snapshot.boot_time is None:
+            up_time = self._snmp_service.get_property(SYS_UP_TIME).safe_value
+            if up_time and up_time.isdigit():
+                # sysUpTime is in hundredths of a second
+                self._snapshot.boot_time = time.time() - int(up_time) / 100
+        return self._snapshot.boot_time
+
+    @property
+    def physical_structure_snmp_table(self) -> QualiMibTable:
+        for _ in self.iter_physical_structure_snmp_table():
+            pass
+        return self._snapshot.physical_structure_snmp_table
+
+    def iter_physical_structure_snmp_table(self):
+        """Iterate over Entity-MIB rows as soon as each of them is loaded.
+
+        The table is loaded only once, iterations started during the load
+        share it, the one that needs the next row first loads it. The lock is
+        held only while a row is loaded, an iteration stopped early doesn't
+        block the others. Rows are completed only by the last column walk, in
+        selective mode they are completed by every batch of GET requests.
+        """
+        snapshot = self._snapshot
+        with self._physical_structure_snmp_table_lock:
+            table = snapshot.physical_structure_snmp_table
+            if table is None and self._loading is None:
+                loaded_table = QualiMibTable(self.TABLE_NAME)
+                self._loading = (
+                    loaded_table,
+                    [],
+                    self._load_physical_structure_snmp_table(loaded_table),
+                )
+            loading = self._loading
+        if table is not None:
+            yield from table.items()
+            return
+
+        loaded_table, rows, loader = loading
+        position = 0
+        while True:
+            with self._physical_structure_snmp_table_lock:
+                if position == len(rows):
+                    if self._loading is not loading:
+                        if snapshot.physical_structure_snmp_table is None:
+                            raise GeneralAutoloadError("Failed to load ENTITY-MIB")
+                        return
+                    try:
+                        rows.append(next(loader))
+                    except StopIteration:
+                        snapshot.physical_structure_snmp_table = loaded_table
+                        self._loading = None
+                        return
+                    except Exception:
+                        # the next iteration loads the table again
+                        self._loading = None
+                        raise
+                row = rows[position]
+            position += 1
+            yield row
 
     @property
-    @lru_cache()
     def physical_structure_table(self):
-        table = self.physical_structure_snmp_table.get_columns(
-            ENTITY_PARENT_ID.object_name
+        if self._snapshot.physical_structure_table is None:
+            table = self.physical_structure_snmp_table.get_columns(
+                ENTITY_PARENT_ID.object_name
+            )
+            self._snapshot.physical_structure_table = {
+                k: v.get(ENTITY_PARENT_ID.object_name).safe_value
+                for k, v in table.items()
+                if v.get(ENTITY_PARENT_ID.object_name)
+                and v.get(ENTITY_PARENT_ID.object_name).safe_value is not None
+            }
+        return self._snapshot.physical_structure_table
+
+    @property
+    def port_mapping_snmp_table(self):
+        if self._snapshot.port_mapping_snmp_table is None:
+            port_map = {}
+            for item in self._snmp_service.walk(ENTITY_TO_IF_ID):
+                if item.safe_value:
+                    if_index = item.safe_value.replace("IF-MIB::ifIndex.", "")
+                    index = item.index[: item.index.rfind(".")]
+                    port_map[if_index] = index
+            self._snapshot.port_mapping_snmp_table = port_map
+
+        return self._snapshot.port_mapping_snmp_table
+
+    @property
+    def subtree_indexes(self) -> list[str]:
+        """Indexes of the root entity and all entities contained in it."""
+        if self._subtree_indexes is None:
+            if self.root_index is None:
+                self._subtree_indexes = list(self.physical_structure_snmp_table)
+            else:
+                self._subtree_indexes = self._get_subtree_indexes(
+                    self.physical_structure_table
+                )
+        return self._subtree_indexes
+
+    def _get_subtree_indexes(self, parents: dict[str, str]) -> list[str]:
+        children = defaultdict(list)
+        for index, parent_index in parents.items():
+            children[parent_index].append(index)
+        subtree_indexes = []
+        visited = set()
+        stack = [self.root_index]
+        while stack:
+            index = stack.pop()
+            if index in visited:
+                continue
+            visited.add(index)
+            subtree_indexes.append(index)
+            stack.extend(reversed(children.get(index, [])))
+        return subtree_indexes
+
+    def _get_ancestor_indexes(self, parents: dict[str, str]) -> list[str]:
+        ancestor_indexes = []
+        index = parents.get(self.root_index)
+        while index in parents and index not in ancestor_indexes:
+            ancestor_indexes.append(index)
+            index = parents.get(index)
+        return ancestor_indexes
+
+    def _load_physical_structure_snmp_table(self, table: QualiMibTable):
+        if self.root_index is not None:
+            yield from self._load_subtree_snmp_table(table)
+            return
+
+        if not self._selective_retrieval:
+            table.update(
+                self._snmp_service.get_multiple_columns(ENTITY_TABLE_REQUIRED_COLUMNS)
+            )
+            yield from table.items()
+            return
+
+        table.update(
+            self._snmp_service.get_multiple_columns(ENTITY_TABLE_CLASSIFICATION_COLUMNS)
+        )
+        indexes = []
+        for index, row in table.items():
+            if self._is_structure_candidate(BaseEntity(index, row)):
+                indexes.append(index)
+            else:
+                yield index, row
+        self._logger.debug(
+            f"Loading details of {len(indexes)} out of {len(table)} entities"
         )
-        return {
-            k: v.get(ENTITY_PARENT_ID.object_name).safe_value
-            for k, v in table.items()
+        yield from self._load_rows_details(table, indexes, ENTITY_TABLE_DETAILS_COLUMNS)
+
+    def _load_subtree_snmp_table(self, table: QualiMibTable):
+        """Walk only entPhysicalContainedIn and GET the rest for the subtree."""
+        parents_table = self._snmp_service.get_multiple_columns([ENTITY_PARENT_ID])
+        parents = {
+            k: v[ENTITY_PARENT_ID.object_name].safe_value
+            for k, v in parents_table.items()
             if v.get(ENTITY_PARENT_ID.object_name)
-            and v.get(ENTITY_PARENT_ID.object_name).safe_value is not None
         }
+        if self.root_index not in parents:
+            self._logger.warning(f"Entity {self.root_index} is not found")
+            return
+        self._subtree_indexes = self._get_subtree_indexes(parents)
+        indexes = self._get_ancestor_indexes(parents)[::-1] + self._subtree_indexes
+        for index in indexes:
+            table[index] = parents_table[index]
+        self._logger.debug(
+            f"Loading {len(indexes)} out of {len(parents_table)} entities "
+            f"for the subtree of {self.root_index}"
+        )
+        yield from self._load_rows_details(
+            table,
+            indexes,
+            [x for x in ENTITY_TABLE_REQUIRED_COLUMNS if x is not ENTITY_PARENT_ID],
+        )
 
-    @property
-    @lru_cache()
-    def port_mapping_snmp_table(self):
-        port_map = {}
-        for item in self._snmp_service.walk(ENTITY_TO_IF_ID):
-            if item.safe_value:
-                if_index = item.safe_value.replace("IF-MIB::ifIndex.", "")
-                index = item.index[: item.index.rfind(".")]
-                port_map[if_index] = index
-
-        return port_map
+    def _load_rows_details(self, table: QualiMibTable, indexes, columns):
+        """GET columns of the rows in batches, yield rows of every loaded batch."""
+        for batch_indexes, responses in get_rows_by_index(
+            self._snmp_service, self._logger, columns, indexes, self.GET_BATCH_SIZE
+        ):
+            for response in responses:
+                row = table.get(response.index)
+                if row is not None:
+                    row[response.mib_id] = response
+            for index in batch_indexes:
+                yield index, table[index]
+
+    def _is_structure_candidate(self, entity: BaseEntity) -> bool:
+        """Entity that can become a chassis, module, port or power supply.
+
+        Containers are kept as well, they define positions of modules.
+        """
+        entity_class = self._entity_helper.get_physical_class(entity)
+        if not entity_class and not entity.vendor_type:
+            # can be a chassis recognized by its name and position
+            return True
+        return bool(ENTITY_VALID_CLASS_PATTERN.search(entity_class))
@@ -1,30 +1,71 @@
 from __future__ import annotations
 
-from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from cloudshell.snmp.autoload.constants.entity_constants import ENTITY_TO_IF_ID
+from cloudshell.snmp.autoload.helper.snmp_autoload_helper import (
+    get_rows_by_index,
+    if_index_sort_key,
+)
 
 if TYPE_CHECKING:
+    from cloudshell.snmp.autoload.helper.entity_snapshot_cache import EntitySnapshot
+
     LogicalId = str
     PhysId = str
 
 
 class SnmpPortMappingTable:
-    def __init__(self, snmp_handler, logger):
+    def __init__(
+        self,
+        snmp_handler,
+        logger,
+        physical_indexes=None,
+        snapshot: EntitySnapshot | None = None,
+    ):
+        """Init.
+
+        :param physical_indexes: GET mapping only of these entities
+            instead of walking the whole table
+        :param snapshot: ENTITY-MIB snapshot of the SnmpEntityTable, the mapping
+            is reused from it and kept in it for the next discovery
+        """
         self._snmp_service = snmp_handler
         self._logger = logger
+        self._physical_indexes = physical_indexes
+        self._snapshot = snapshot
+        self._port_mapping_snmp_table = None
+        if snapshot is not None:
+            self._port_mapping_snmp_table = snapshot.port_mapping_snmp_table
 
     @property
-    @lru_cache()
     def port_mapping_snmp_table(self) -> dict[LogicalId, PhysId]:
         """Port mapping logical to physical indices, based on
         ENTITY-MIB.entAliasMappingIdentifier."""  # noqa: D205, D400, D209
-        port_map = {}
-        for item in self._snmp_service.walk(ENTITY_TO_IF_ID):
+        if self._port_mapping_snmp_table is None:
+            self._port_mapping_snmp_table = self._get_port_mapping()
+            if self._snapshot is not None:
+                self._snapshot.port_mapping_snmp_table = self._port_mapping_snmp_table
+        return self._port_mapping_snmp_table
+
+    def _get_port_mapping(self) -> dict[LogicalId, PhysId]:
+        mapping = []
+        for item in self._get_mapping_items():
             if item.safe_value:
                 if_index = item.safe_value.replace("IF-MIB::ifIndex.", "")
                 index = item.index[: item.index.rfind(".")]
-                port_map[if_index] = index
-        port_map = dict(sorted(port_map.items()))
-        return port_map
+                mapping.append((if_index, index))
+        # the walk is ordered by entPhysicalIndex, the map by ifIndex
+        mapping.sort(key=lambda x: if_index_sort_key(x[0]))
+        return dict(mapping)
+
+    def _get_mapping_items(self):
+        if self._physical_indexes is None:
+            yield from self._snmp_service.walk(ENTITY_TO_IF_ID)
+            return
+        # entAliasLogicalIndexOrZero is 0 for mappings of all logical entities
+        indexes = [f"{x}.0" for x in self._physical_indexes]
+        for _, responses in get_rows_by_index(
+            self._snmp_service, self._logger, [ENTITY_TO_IF_ID], indexes
+        ):
+            yield from responses
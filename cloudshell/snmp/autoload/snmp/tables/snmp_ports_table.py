@@ -1,8 +1,25 @@
-from functools import lru_cache
+from __future__ import annotations
+
+from pysnmp.proto.errind import RequestTimedOut
 
 from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
 
-from cloudshell.snmp.autoload.constants import port_constants
+from cloudshell.snmp.autoload.constants import discovery_profiles, port_constants
+from cloudshell.snmp.autoload.exceptions.snmp_autoload_error import GeneralAutoloadError
+from cloudshell.snmp.autoload.helper.snmp_autoload_helper import (
+    GET_BATCH_SIZE,
+    get_rows_by_index,
+)
+from cloudshell.snmp.autoload.helper.synchronized_snmp_service import (
+    SynchronizedSnmpService,
+)
+from cloudshell.snmp.autoload.snmp.entities.snmp_port_attributes import (
+    SnmpPortAttributes,
+)
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.port_attributes_scheduler import (
+    PortAttributesScheduler,
+)
 from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_associated_ports import (
     PortChannelsAssociatedPorts,
 )
@@ -18,12 +35,44 @@ from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_ports_dupl
 from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_ports_neighbors_table import (
     PortNeighbours,
 )
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_interface import (
+    PortAttributesServiceInterface,
+)
 
 
 class SnmpPortsTable:
-    def __init__(self, snmp_handler, logger):
+    GET_BATCH_SIZE = GET_BATCH_SIZE  # GET requests in flight in selective mode
+    # providers of vendor shells, created with the snmp handler and logger
+    PORT_ATTRIBUTES_PROVIDERS: list[type[PortAttributesServiceInterface]] = []
+    # provider classes fetched by the discovery profile, None for every provider
+    DISCOVERY_PROFILES = {
+        discovery_profiles.MINIMAL: (),
+        discovery_profiles.STANDARD: (
+            PortIPTables,
+            PortDuplex,
+            PortChannelsAssociatedPorts,
+        ),
+        discovery_profiles.FULL: None,
+    }
+
+    def __init__(self, snmp_handler, logger, selective_retrieval=False):
+        """Init.
+
+        :param selective_retrieval: walk only the columns needed to classify
+            interfaces and GET the rest only for ports and port channels
+        """
+        # providers are loaded in threads of their own
+        snmp_handler = SynchronizedSnmpService.wrap(snmp_handler)
         self._snmp = snmp_handler
         self._logger = logger
+        self._selective_retrieval = selective_retrieval
+        self._if_indexes = None
+        self._port_table = None
+        self._detailed_indexes = set()
+        self._port_indexes = None
+        self._port_channel_indexes = None
+        self._port_attributes = None
+        self._port_channel_attributes = None
         self._port_ip_tables = PortIPTables(snmp_handler, logger)
         self._port_neighbors = PortNeighbours(snmp_handler, logger)
         self._port_auto_neg = PortAutoNegotiation(snmp_handler, logger)
@@ -31,52 +80,310 @@ class SnmpPortsTable:
         self._port_channel_associated_ports = PortChannelsAssociatedPorts(
             snmp_handler, logger
         )
+        self._registered_providers = [
+            x(snmp_handler, logger) for x in self.PORT_ATTRIBUTES_PROVIDERS
+        ]
+        self._scheduler = PortAttributesScheduler(logger)
+        self._profile = discovery_profiles.FULL
+
+    @property
+    def providers(self) -> list[PortAttributesServiceInterface]:
+        """Built-in and registered providers of port attributes."""
+        return [
+            self._port_ip_tables,
+            self._port_neighbors,
+            self._port_auto_neg,
+            self._port_duplex,
+            self._port_channel_associated_ports,
+        ] + self._registered_providers
+
+    def register_provider(self, provider: PortAttributesServiceInterface) -> None:
+        """Add a provider filling its PORT_FIELDS of every Port.
+
+        Has to be registered before the discovery.
+        """
+        self._registered_providers.append(provider)
+
+    def set_profile(self, profile: str) -> None:
+        """Fetch only the attribute tables of the discovery profile.
+
+        Fields of the tables not fetched are left unset.
+        Has to be set before the attribute tables are loaded.
+        """
+        if profile not in self.DISCOVERY_PROFILES:
+            raise GeneralAutoloadError(f"Unknown discovery profile {profile}")
+        self._profile = profile
+
+    def is_fetched(self, provider: PortAttributesServiceInterface) -> bool:
+        provider_classes = self.DISCOVERY_PROFILES[self._profile]
+        return provider_classes is None or isinstance(provider, provider_classes)
+
+    @property
+    def fetched_providers(self) -> list[PortAttributesServiceInterface]:
+        return [x for x in self.providers if self.is_fetched(x)]
+
+    @property
+    def port_fields(self) -> set[str]:
+        """Port and port channel fields filled by the fetched providers."""
+        return {field for x in self.fetched_providers for field in x.PORT_FIELDS}
+
+    def start_loading(self) -> None:
+        """Start loading of the fetched tables, each in a thread of its own.
+
+        SNMP requests of the threads are sent one at a time.
+        Tables that can be loaded for known ifIndexes start once the ports
+        are classified, see set_port_indexes.
+        """
+        self._scheduler.start(
+            [x for x in self.fetched_providers if not x.LOAD_BY_IF_INDEX]
+        )
+
+    def set_if_indexes(self, if_indexes) -> None:
+        """GET IF-MIB rows only of these interfaces instead of walking the table.
+
+        Has to be set before the port table is loaded.
+        """
+        self._if_indexes = list(if_indexes)
 
     @property
-    @lru_cache()
     def port_table(self) -> QualiMibTable:
-        """Load all cisco required snmp tables."""
-        walk = self._snmp.get_multiple_columns(port_constants.IF_TABLE)
-        return walk
+        """Load all cisco required snmp tables.
+
+        In selective mode rows have only the classification columns until
+        their details are loaded.
+        """
+        if self._port_table is None:
+            columns = port_constants.IF_TABLE
+            if self._selective_retrieval:
+                columns = port_constants.IF_TABLE_CLASSIFICATION_COLUMNS
+            if self._if_indexes is not None:
+                self._port_table = self._get_if_rows(self._if_indexes, columns)
+            else:
+                self._port_table = self._snmp.get_multiple_columns(columns)
+        return self._port_table
+
+    def load_rows_details(self, if_indexes) -> None:
+        """GET the rest of the columns of the interfaces in selective mode.
+
+        Columns are added to the rows already loaded, so interfaces created
+        from them see the details as well.
+        """
+        if not self._selective_retrieval:
+            return
+        indexes = [
+            x
+            for x in if_indexes
+            if x not in self._detailed_indexes and x in self.port_table
+        ]
+        self._logger.debug(
+            f"Loading details of {len(indexes)} out of {len(self.port_table)} "
+            f"interfaces"
+        )
+        try:
+            for _, responses in get_rows_by_index(
+                self._snmp,
+                self._logger,
+                port_constants.IF_TABLE_DETAILS_COLUMNS,
+                indexes,
+                self.GET_BATCH_SIZE,
+                raise_errors=True,
+            ):
+                for response in responses:
+                    row = self._port_table.get(response.index)
+                    if row is not None:
+                        row[response.mib_id] = response
+        except (RequestTimedOut, ReadSNMPException) as e:
+            self._logger.warning(
+                f"Failed to GET details of the interfaces, walking them: {e}"
+            )
+            self._walk_rows_details()
+            return
+        self._detailed_indexes.update(indexes)
+
+    def load_all_rows_details(self) -> None:
+        """Walk the rest of the columns of every interface in selective mode.
+
+        The walk is cheaper than GET requests if details of most of the
+        interfaces are needed, rows loaded for set_if_indexes are still GET.
+        """
+        if not self._selective_retrieval:
+            return
+        if self._if_indexes is not None:
+            self.load_rows_details(self.port_table)
+        else:
+            self._walk_rows_details()
+
+    def _walk_rows_details(self) -> None:
+        details_table = self._snmp.get_multiple_columns(
+            port_constants.IF_TABLE_DETAILS_COLUMNS
+        )
+        for index, row in self.port_table.items():
+            row.update(details_table.get(index, {}))
+        self._detailed_indexes.update(self._port_table)
+
+    def set_port_indexes(self, if_indexes, port_channel_indexes=None) -> None:
+        """Interfaces that become ports or port channels.
+
+        Attribute tables indexed by ifIndex can GET only their rows, the
+        number of interfaces of the device is the estimate of their size.
+        Has to be set before the attribute tables are loaded.
+
+        :param port_channel_indexes: the ones of if_indexes that are port
+            channels, they aren't requested from the duplex and auto negotiation
+            tables, members of port channels aren't loaded if there are none
+        """
+        if_indexes = list(if_indexes)
+        if port_channel_indexes is None:
+            self._port_indexes = if_indexes
+            self._port_channel_indexes = if_indexes
+        else:
+            self._port_channel_indexes = list(port_channel_indexes)
+            port_channels = set(self._port_channel_indexes)
+            self._port_indexes = [x for x in if_indexes if x not in port_channels]
+        estimated_rows = self._get_if_number()
+        providers = [x for x in self.fetched_providers if x.LOAD_BY_IF_INDEX]
+        if port_channel_indexes is not None and not port_channel_indexes:
+            providers = [
+                x for x in providers if x is not self._port_channel_associated_ports
+            ]
+        port_providers = (self._port_duplex, self._port_auto_neg)
+        for provider in providers:
+            if provider in port_providers:
+                provider.set_if_indexes(self._port_indexes, estimated_rows)
+            else:
+                provider.set_if_indexes(if_indexes, estimated_rows)
+        self._scheduler.start(providers)
+
+    def get_port_attributes(self, if_index: str) -> SnmpPortAttributes:
+        """IP addresses, duplex and auto negotiation of the Port.
+
+        Attributes of all ports are joined in a single pass on the first call
+        once they are known, see set_port_indexes, interfaces missed by it are
+        joined on demand.
+        """
+        providers = (self._port_ip_tables, self._port_duplex, self._port_auto_neg)
+        if self._port_attributes is None:
+            self._port_attributes = self._join_port_attributes(
+                self._port_indexes or [], providers
+            )
+        return self._get_joined_attributes(self._port_attributes, if_index, providers)
+
+    def get_port_channel_attributes(self, if_index: str) -> SnmpPortAttributes:
+        """IP addresses and associated ports of the PortChannel."""
+        providers = (self._port_ip_tables, self._port_channel_associated_ports)
+        if self._port_channel_attributes is None:
+            self._port_channel_attributes = self._join_port_attributes(
+                self._port_channel_indexes or [], providers
+            )
+        return self._get_joined_attributes(
+            self._port_channel_attributes, if_index, providers
+        )
+
+    def _get_joined_attributes(
+        self, joined_attributes, if_index, providers
+    ) -> SnmpPortAttributes:
+        attributes = joined_attributes.get(if_index)
+        if attributes is None:
+            attributes = self._join_port_attributes([if_index], providers)[if_index]
+            joined_attributes[if_index] = attributes
+        return attributes
+
+    def _join_port_attributes(
+        self, if_indexes, providers
+    ) -> dict[str, SnmpPortAttributes]:
+        """Attributes of the providers not fetched are left None."""
+        attributes = {x: SnmpPortAttributes(if_index=x) for x in if_indexes}
+        providers = [x for x in providers if self.is_fetched(x)]
+        if self._port_ip_tables in providers:
+            ip_table = self.port_ip_table
+            for if_index, x in attributes.items():
+                x.ipv4_address = ip_table.get_all_ipv4_by_index(if_index)
+                x.ipv6_address = ip_table.get_all_ipv6_by_index(if_index)
+        if self._port_duplex in providers:
+            duplex = self.port_duplex
+            for if_index, x in attributes.items():
+                x.duplex = duplex.get_duplex_by_port_index(if_index)
+        if self._port_auto_neg in providers:
+            auto_neg = self.port_auto_neg
+            for if_index, x in attributes.items():
+                x.auto_negotiation = auto_neg.get_value_by_index(if_index)
+        if self._port_channel_associated_ports in providers:
+            associated_ports = self.port_channel_associated_ports
+            for if_index, x in attributes.items():
+                x.associated_ports = associated_ports.get_associated_ports(if_index)
+        return attributes
+
+    def _get_if_number(self) -> int:
+        """Number of interfaces, ifTable may be loaded only for a subtree."""
+        if self._if_indexes is None:
+            return len(self.port_table)
+        if_number = self._snmp.get_property(port_constants.PORT_NUMBER).safe_value
+        if if_number and if_number.isdigit():
+            return int(if_number)
+        return len(self.port_table)
+
+    def _get_if_rows(self, if_indexes, columns) -> QualiMibTable:
+        table = QualiMibTable("ifTable")
+        for _, responses in get_rows_by_index(
+            self._snmp, self._logger, columns, if_indexes, self.GET_BATCH_SIZE
+        ):
+            for response in responses:
+                table.setdefault(response.index, {})[response.mib_id] = response
+        return table
+
+    def _load_table(self, table):
+        self._scheduler.wait(table)
+        return table
 
     @property
-    @lru_cache()
     def port_ip_table(self):
         """Load all cisco required snmp tables."""
-        self._port_ip_tables.load_snmp_table()
-        return self._port_ip_tables
+        return self._load_table(self._port_ip_tables)
 
     @property
-    @lru_cache()
     def port_neighbors(self):
         """Load all cisco required snmp tables."""
-        self._port_neighbors.load_snmp_table()
-        return self._port_neighbors
+        return self._load_table(self._port_neighbors)
 
     @property
-    @lru_cache()
     def port_duplex(self):
         """Load all cisco required snmp tables."""
-        self._port_duplex.load_snmp_table()
-        return self._port_duplex
+        return self._load_table(self._port_duplex)
 
     @property
-    @lru_cache()
     def port_auto_neg(self):
         """Load all cisco required snmp tables."""
-        self._port_auto_neg.load_snmp_table()
-        return self._port_auto_neg
+        return self._load_table(self._port_auto_neg)
 
     @property
-    @lru_cache()
     def port_channel_associated_ports(self):
         """Load port channel members snmp tables."""
-        self._port_channel_associated_ports.load_snmp_table()
-        return self._port_channel_associated_ports
+        return self._load_table(self._port_channel_associated_ports)
+
+    @property
+    def registered_providers(self) -> list[PortAttributesServiceInterface]:
+        """Loaded providers of vendor shells fetched by the profile."""
+        return [
+            self._load_table(x)
+            for x in self._registered_providers
+            if self.is_fetched(x)
+        ]
+
+    def compact(self):
+        """Release IF-MIB rows and attribute tables once the ports are built.
+
+        Tables started but never read are still loaded in their threads,
+        they're waited for before the release.
+        """
+        self._scheduler.wait_all()
+        self._port_table = QualiMibTable("ifTable")
+        self._detailed_indexes = set()
+        self._port_attributes = {}
+        self._port_channel_attributes = {}
+        for provider in self.providers:
+            provider.compact()
 
     def finalize_threads(self):
-        self._port_ip_tables.finalize_thread()
-        self._port_neighbors.finalize_thread()
-        self._port_auto_neg.finalize_thread()
-        self._port_duplex.finalize_thread()
-        self._port_channel_associated_ports.finalize_thread()
+        self._scheduler.finalize_threads()
+        for provider in self.providers:
+            provider.finalize_thread()
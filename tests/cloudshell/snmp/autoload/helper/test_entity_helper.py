@@ -166,3 +166,44 @@ class TestEntityHelper:
 
         # Assert
         assert result == ""
+
+    def test_get_physical_class_last_matching_vendor_type_wins(self):
+        # Arrange
+        entity = BaseEntity(
+            "1",
+            {
+                ENTITY_VENDOR_TYPE.object_name: Mock(
+                    safe_value="CISCO-ENTITY-VENDORTYPE-OID-MIB::cevContainerPort"
+                ),
+                ENTITY_CLASS.object_name: Mock(safe_value="other"),
+            },
+        )
+
+        # Act
+        result = EntityHelper().get_physical_class(entity)
+
+        # Assert
+        assert result == "port"
+
+    def test_get_physical_class_is_memoized(self):
+        # Arrange
+        helper = EntityHelper()
+        entities = [
+            BaseEntity(
+                str(index),
+                {
+                    ENTITY_VENDOR_TYPE.object_name: Mock(safe_value="cevModuleX"),
+                    ENTITY_CLASS.object_name: Mock(safe_value=""),
+                },
+            )
+            for index in range(10)
+        ]
+
+        # Act
+        result = {helper.get_physical_class(entity) for entity in entities}
+
+        # Assert
+        assert result == {"module"}
+        assert helper.cache_info().misses == 1
+        assert helper.cache_info().hits == 9
+        assert helper.cache_info().currsize == 1
@@ -0,0 +1,131 @@
+from copy import deepcopy
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+
+from cloudshell.snmp.autoload.generic_snmp_autoload import GenericSNMPAutoload
+from cloudshell.snmp.autoload.helper.entity_snapshot_cache import (
+    EntitySnapshot,
+    EntitySnapshotCache,
+    SnapshotValue,
+)
+
+from tests.cloudshell.snmp.autoload.data.physical_entities_data import (
+    MOCK_SNMP_RESPONSE,
+)
+
+
+class TestEntitySnapshotCache(TestCase):
+    def _discover_entities(self, cache, last_change_time, up_time="360000"):
+        snmp = Mock()
+        snmp.get_property.side_effect = lambda oid: Mock(
+            safe_value=up_time if oid.object_name == "sysUpTime" else last_change_time
+        )
+        table = QualiMibTable("entPhysicalTable")
+        table.update(deepcopy(MOCK_SNMP_RESPONSE))
+        snmp.get_multiple_columns.return_value = table
+        snmp.walk.return_value = [Mock(safe_value="IF-MIB::ifIndex.5", index="4117.0")]
+        resource_model = NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", Mock()
+        )
+        autoload = GenericSNMPAutoload(snmp, Mock(), resource_model)
+        autoload.set_entity_snapshot_cache(cache, "192.168.1.1")
+        ports = autoload.physical_table_service.physical_ports_list
+        assert autoload.port_snmp_mapping_table.port_mapping_snmp_table == {"5": "4117"}
+        autoload._save_entity_snapshot()
+        return snmp, ports
+
+    def _cached_snapshot(self, cache):
+        return cache._snapshots["192.168.1.1"]
+
+    def test_entities_reused_while_not_changed(self):
+        cache = EntitySnapshotCache()
+        snmp, ports = self._discover_entities(cache, "1234")
+
+        snmp_2, ports_2 = self._discover_entities(cache, "1234")
+
+        snmp.get_multiple_columns.assert_called_once()
+        snmp_2.get_multiple_columns.assert_not_called()
+        assert ports_2 == ports
+        assert len(cache) == 1
+
+    def test_port_mapping_reused_while_not_changed(self):
+        cache = EntitySnapshotCache()
+        snmp, _ = self._discover_entities(cache, "1234")
+
+        snmp_2, _ = self._discover_entities(cache, "1234")
+        snmp_3, _ = self._discover_entities(cache, "5678")
+
+        snmp.walk.assert_called_once()
+        snmp_2.walk.assert_not_called()
+        snmp_3.walk.assert_called_once()
+        assert self._cached_snapshot(cache).port_mapping_snmp_table == {"5": "4117"}
+
+    def test_entities_loaded_when_changed(self):
+        cache = EntitySnapshotCache()
+        self._discover_entities(cache, "1234")
+
+        snmp, ports = self._discover_entities(cache, "5678")
+
+        snmp.get_multiple_columns.assert_called_once()
+        assert ports
+        boot_time = self._cached_snapshot(cache).boot_time
+        assert cache.get("192.168.1.1", "1234", boot_time) is None
+        assert cache.get("192.168.1.1", "5678", boot_time)
+
+    def test_not_supported_last_change_time(self):
+        cache = EntitySnapshotCache()
+        self._discover_entities(cache, "")
+
+        snmp, _ = self._discover_entities(cache, "")
+
+        snmp.get_multiple_columns.assert_called_once()
+        assert len(cache) == 0
+
+    def test_not_updated_last_change_time(self):
+        cache = EntitySnapshotCache()
+        self._discover_entities(cache, "0")
+
+        snmp, _ = self._discover_entities(cache, "0")
+
+        snmp.get_multiple_columns.assert_called_once()
+        assert len(cache) == 0
+
+    def test_entities_loaded_after_reboot(self):
+        cache = EntitySnapshotCache()
+        self._discover_entities(cache, "1234", up_time="360000")
+
+        snmp, ports = self._discover_entities(cache, "1234", up_time="6000")
+
+        snmp.get_multiple_columns.assert_called_once()
+        assert ports
+        assert len(cache) == 1
+
+    def test_snapshot_keeps_decoded_values_only(self):
+        cache = EntitySnapshotCache()
+        self._discover_entities(cache, "1234")
+
+        snapshot = self._cached_snapshot(cache)
+
+        assert all(
+            type(value) is SnapshotValue
+            for row in snapshot.physical_structure_snmp_table.values()
+            for value in row.values()
+        )
+        ingested_entities, _ = next(iter(snapshot.ingestions.values()))
+        assert all(type(index) is str for index in ingested_entities)
+
+    def test_max_size(self):
+        cache = EntitySnapshotCache(max_size=2)
+        for device_id in ("1", "2", "3"):
+            snapshot = EntitySnapshot()
+            snapshot.last_change_time = "1234"
+            snapshot.boot_time = 1000.0
+            snapshot.physical_structure_snmp_table = QualiMibTable("entPhysicalTable")
+            cache.put(device_id, snapshot)
+
+        assert len(cache) == 2
+        assert cache.get("1", "1234", 1000.0) is None
+        assert cache.get("3", "1234", 1000.0)
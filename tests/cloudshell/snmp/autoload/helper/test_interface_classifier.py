@@ -0,0 +1,121 @@
+import logging
+import time
+from itertools import product
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from cloudshell.snmp.autoload.helper.interface_classifier import (
+    EXCLUDED,
+    PORT,
+    PORT_CHANNEL,
+)
+from cloudshell.snmp.autoload.services.port_table import PortsTable
+
+LOGGER = logging.getLogger(__name__)
+INTERFACES_COUNT = 60000
+IF_NAMES = ["", "Gi0/1", "Port-channel10", "ae1", "Mgmt0", "lag-2", "Null0"]
+IF_TYPES = ["ethernetCsmacd", "ieee8023adLag", "propVirtual", "other", "tunnel"]
+
+
+class CustomPortsTable(PortsTable):
+    def _is_valid_port(self, port):
+        return port.if_name.startswith("Gi")
+
+
+class CustomPatternPortsTable(PortsTable):
+    @property
+    def port_exclude_re(self):
+        return self._get_pattern([r"^gi"])
+
+
+def _create_interfaces():
+    """Router with sub-interfaces of a few physical ports."""
+    interfaces = []
+    for index in range(INTERFACES_COUNT):
+        if index % 100:
+            if_name = f"TenGigE0/0/0/{index % 24}.{index}"
+            if_type = "l2vlan" if index % 3 else "ethernetCsmacd"
+        else:
+            if_name, if_type = f"Bundle-Ether{index}", "ieee8023adLag"
+        interfaces.append(
+            SimpleNamespace(
+                if_index=str(index),
+                if_name=if_name,
+                if_descr_name=if_name,
+                if_type=if_type,
+            )
+        )
+    return interfaces
+
+
+def _measure(classify, interfaces):
+    start = time.perf_counter()
+    result = [classify(x) for x in interfaces]
+    return result, time.perf_counter() - start
+
+
+def test_classifier_matches_validation():
+    table = PortsTable(Mock(), Mock(), Mock())
+    table.PORT_NAME_LIST = [r"^null"]
+    table.PORT_CHANNEL_EXCLUDE_LIST = [r"lag-2"]
+    classifier = table.interface_classifier
+
+    for if_name, if_descr_name, if_type in product(IF_NAMES, IF_NAMES, IF_TYPES):
+        port = SimpleNamespace(
+            if_name=if_name, if_descr_name=if_descr_name, if_type=if_type
+        )
+        assert classifier.classify(if_name, if_descr_name, if_type) == (
+            table._classify_port(port)
+        ), port
+
+
+def test_classifier_rebuilt_for_changed_lists():
+    table = PortsTable(Mock(), Mock(), Mock())
+    classifier = table.interface_classifier
+
+    assert table.interface_classifier is classifier
+    assert classifier.classify("Mgmt0", "", "ethernetCsmacd") == EXCLUDED
+    table.PORT_EXCLUDE_LIST = []
+    assert table.interface_classifier.classify("Mgmt0", "", "ethernetCsmacd") == PORT
+
+
+def test_custom_validation_kept():
+    table = CustomPortsTable(Mock(), Mock(), Mock())
+    port = SimpleNamespace(if_name="Mgmt0", if_descr_name="", if_type="tunnel")
+
+    assert table._has_custom_validation
+    assert not PortsTable(Mock(), Mock(), Mock())._has_custom_validation
+    assert table._classify_port(port) == EXCLUDED
+    port.if_name = "Gi0/1"
+    assert table._classify_port(port) == PORT
+
+
+def test_custom_pattern_kept():
+    table = CustomPatternPortsTable(Mock(), Mock(), Mock())
+    port = SimpleNamespace(if_name="Gi0/1", if_descr_name="", if_type="ethernetCsmacd")
+
+    assert table._has_custom_validation
+    assert table._classify_port(port) == EXCLUDED
+    port.if_name = "Mgmt0"
+    assert table._classify_port(port) == PORT
+
+
+def test_classifier_benchmark():
+    table = PortsTable(Mock(), Mock(), Mock())
+    classifier = table.interface_classifier
+    interfaces = _create_interfaces()
+
+    expected, validation_time = _measure(table._classify_port, interfaces)
+    result, classifier_time = _measure(
+        lambda x: classifier.classify(x.if_name, x.if_descr_name, x.if_type),
+        interfaces,
+    )
+    LOGGER.info(
+        "%s interfaces classified: %.3fs, %.3fs with the classifier",
+        INTERFACES_COUNT,
+        validation_time,
+        classifier_time,
+    )
+
+    assert result == expected
+    assert result.count(PORT_CHANNEL) == INTERFACES_COUNT // 100
@@ -3,9 +3,17 @@ from unittest.mock import Mock
 
 from cloudshell.shell.standards.autoload_generic_models import GenericPort
 from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
 
 from cloudshell.snmp.autoload.helper.module_helper import ModuleHelper
 from cloudshell.snmp.autoload.services.physical_entities_table import PhysicalTable
+from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
+
+
+def _create_empty_entity_table():
+    snmp = Mock()
+    snmp.get_multiple_columns.return_value = QualiMibTable("entPhysicalTable")
+    return SnmpEntityTable(snmp, Mock())
 
 
 class TestPhysicalTable(TestCase):
@@ -13,8 +21,7 @@ class TestPhysicalTable(TestCase):
         resource_model = NetworkingResourceModel(
             "Resource Name", "Shell Name", "CS_Switch", Mock()
         )
-        entity_table = Mock()
-        entity_table.physical_structure_snmp_table = {}
+        entity_table = _create_empty_entity_table()
         table = PhysicalTable(entity_table, Mock(), resource_model)
         result = ModuleHelper(
             physical_table_service=table,
@@ -27,8 +34,7 @@ class TestPhysicalTable(TestCase):
         resource_model = NetworkingResourceModel(
             "Resource Name", "Shell Name", "CS_Switch", Mock()
         )
-        entity_table = Mock()
-        entity_table.physical_structure_snmp_table = {}
+        entity_table = _create_empty_entity_table()
         table = PhysicalTable(entity_table, Mock(), resource_model)
         helper = ModuleHelper(
             physical_table_service=table,
@@ -49,8 +55,7 @@ class TestPhysicalTable(TestCase):
         resource_model = NetworkingResourceModel(
             "Resource Name", "Shell Name", "CS_Switch", Mock()
         )
-        entity_table = Mock()
-        entity_table.physical_structure_snmp_table = {}
+        entity_table = _create_empty_entity_table()
         table = PhysicalTable(entity_table, Mock(), resource_model)
         helper = ModuleHelper(
             physical_table_service=table,
@@ -70,8 +75,7 @@ class TestPhysicalTable(TestCase):
         resource_model = NetworkingResourceModel(
             "Resource Name", "Shell Name", "CS_Switch", Mock()
         )
-        entity_table = Mock()
-        entity_table.physical_structure_snmp_table = {}
+        entity_table = _create_empty_entity_table()
         table = PhysicalTable(entity_table, Mock(), resource_model)
         module_helper = ModuleHelper(
             physical_table_service=table,
@@ -90,8 +94,7 @@ class TestPhysicalTable(TestCase):
         resource_model = NetworkingResourceModel(
             "Resource Name", "Shell Name", "CS_Switch", Mock()
         )
-        entity_table = Mock()
-        entity_table.physical_structure_snmp_table = {}
+        entity_table = _create_empty_entity_table()
         table = PhysicalTable(entity_table, Mock(), resource_model)
         module_helper = ModuleHelper(
             physical_table_service=table,
@@ -0,0 +1,258 @@
+import logging
+import time
+from unittest.mock import Mock, patch
+
+from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+
+from cloudshell.snmp.autoload.helper.port_helper import PortHelper
+from cloudshell.snmp.autoload.services.physical_entities_table import PhysicalTable
+from cloudshell.snmp.autoload.services.port_mapping_table import PortMappingService
+from cloudshell.snmp.autoload.services.port_table import PortsTable
+from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
+from cloudshell.snmp.autoload.snmp.tables.snmp_port_mapping_table import (
+    SnmpPortMappingTable,
+)
+from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
+
+LOGGER = logging.getLogger(__name__)
+
+CHASSIS_COUNT = 8
+MODULES_PER_CHASSIS = 4
+PORTS_PER_MODULE = 48
+
+
+class Response:
+    """Lightweight SnmpResponse stand-in, Mock is too slow for 15k rows."""
+
+    def __init__(self, value, index=None):
+        self.safe_value = value
+        self.index = index
+
+
+def _response(value):
+    return Response(value)
+
+
+def _entity_row(parent_id, position, entity_class, name, model="", serial=""):
+    values = {
+        "entPhysicalParentRelPos": position,
+        "entPhysicalDescr": name,
+        "entPhysicalName": name,
+        "entPhysicalContainedIn": parent_id,
+        "entPhysicalClass": entity_class,
+        "entPhysicalVendorType": "",
+        "entPhysicalModelName": model,
+        "entPhysicalSerialNum": serial,
+        "entPhysicalSoftwareRev": "",
+        "entPhysicalHardwareRev": "",
+    }
+    return {k: _response(v) for k, v in values.items()}
+
+
+def _create_snmp():
+    """Synthetic stack of 8 chassis with 4 line cards of 48 ports each."""
+    entities = QualiMibTable("entPhysicalTable")
+    interfaces = QualiMibTable("ifTable")
+    mapping = []
+    for chassis_id in range(1, CHASSIS_COUNT + 1):
+        chassis_index = str(chassis_id * 10000)
+        entities[chassis_index] = _entity_row(
+            "0",
+            str(chassis_id),
+            "chassis",
+            f"Switch {chassis_id}",
+            "C9300",
+            chassis_index,
+        )
+        for module_id in range(1, MODULES_PER_CHASSIS + 1):
+            slot_index = str(chassis_id * 10000 + module_id * 1000)
+            module_index = str(int(slot_index) + 1)
+            entities[slot_index] = _entity_row(
+                chassis_index, str(module_id), "container", f"Slot {module_id}"
+            )
+            entities[module_index] = _entity_row(
+                slot_index, "1", "module", f"Module {module_id}", "NM-48", module_index
+            )
+            for port_id in range(1, PORTS_PER_MODULE + 1):
+                port_index = str(int(slot_index) + 100 + port_id)
+                if_index = str(int(slot_index) + port_id)
+                name = f"GigabitEthernet{chassis_id}/{module_id - 1}/{port_id}"
+                entities[port_index] = _entity_row(
+                    module_index, str(port_id), "port", name
+                )
+                interfaces[if_index] = {
+                    "ifIndex": _response(if_index),
+                    "ifDescr": _response(name),
+                    "ifName": _response(f"Gi{chassis_id}/{module_id - 1}/{port_id}"),
+                    "ifType": _response("ethernetCsmacd"),
+                }
+                mapping.append(
+                    Response(f"IF-MIB::ifIndex.{if_index}", f"{port_index}.0")
+                )
+
+    snmp = Mock()
+    snmp.get_multiple_columns.side_effect = lambda columns: (
+        entities if columns[0].object_name.startswith("ent") else interfaces
+    )
+    snmp.walk.side_effect = lambda oid: (
+        mapping if oid.object_name == "entAliasMappingIdentifier" else []
+    )
+    snmp.get_table.return_value = {}
+    return snmp
+
+
+def _create_stack_snmp():
+    """Stack of 2 switches, each with its own network module in slot 1."""
+    entities = QualiMibTable("entPhysicalTable")
+    interfaces = QualiMibTable("ifTable")
+    mapping = []
+    for chassis_id in (1, 2):
+        chassis_index = str(chassis_id * 10000)
+        slot_index = str(chassis_id * 10000 + 1000)
+        module_index = str(int(slot_index) + 1)
+        entities[chassis_index] = _entity_row(
+            "0",
+            str(chassis_id),
+            "chassis",
+            f"Switch {chassis_id}",
+            "C9300",
+            chassis_index,
+        )
+        entities[slot_index] = _entity_row(chassis_index, "1", "container", "Slot 1")
+        entities[module_index] = _entity_row(
+            slot_index, "1", "module", "Network Module", "C9300-NM-8X", module_index
+        )
+        for sub_id in (0, 1):
+            port_index = str(int(module_index) + 100 + sub_id)
+            if_index = str(chassis_id * 100 + sub_id)
+            name = f"TenGigabitEthernet{chassis_id}/{sub_id}/1"
+            entities[port_index] = _entity_row(module_index, "1", "port", name)
+            interfaces[if_index] = {
+                "ifIndex": _response(if_index),
+                "ifDescr": _response(name),
+                "ifName": _response(f"Te{chassis_id}/{sub_id}/1"),
+                "ifType": _response("ethernetCsmacd"),
+            }
+            mapping.append(Response(f"IF-MIB::ifIndex.{if_index}", f"{port_index}.0"))
+
+    snmp = Mock()
+    snmp.get_multiple_columns.side_effect = lambda columns: (
+        entities if columns[0].object_name.startswith("ent") else interfaces
+    )
+    snmp.walk.side_effect = lambda oid: (
+        mapping if oid.object_name == "entAliasMappingIdentifier" else []
+    )
+    snmp.get_table.return_value = {}
+    return snmp
+
+
+def _dump(resource):
+    return (
+        type(resource).__name__,
+        str(resource.relative_address),
+        resource.name,
+        [_dump(x) for x in resource.extract_sub_resources()],
+    )
+
+
+def _get_ports(resource):
+    resource_type, _, name, children = resource
+    if resource_type == "GenericPort":
+        return [name]
+    return [x for child in children for x in _get_ports(child)]
+
+
+def _get_addresses(resource, resource_type):
+    dumped_type, address, _, children = resource
+    addresses = [address] if dumped_type == resource_type else []
+    return addresses + [
+        x for child in children for x in _get_addresses(child, resource_type)
+    ]
+
+
+def _create_port_helper(snmp):
+    logger = Mock()
+    resource_model = NetworkingResourceModel(
+        "Resource Name", "Shell Name", "CS_Switch", Mock()
+    )
+    physical_table = PhysicalTable(
+        SnmpEntityTable(snmp, logger), logger, resource_model
+    )
+    port_table = PortsTable(resource_model, SnmpPortsTable(snmp, logger), logger)
+    mapping_service = PortMappingService(
+        logger, SnmpPortMappingTable(snmp, logger), physical_table, port_table
+    )
+    _ = port_table.ports_dict
+    port_helper = PortHelper(
+        physical_table_service=physical_table,
+        port_table_service=port_table,
+        port_mapping_table_service=mapping_service,
+        resource_model=resource_model,
+        logger=logger,
+    )
+    return port_helper, physical_table
+
+
+def _build_ports_structure(snmp):
+    port_helper, physical_table = _create_port_helper(snmp)
+    port_helper.build_ports_structure()
+
+    structure = [_dump(x) for x in physical_table.physical_chassis_dict.values()]
+    return structure, port_helper._identified_ports
+
+
+def _build_with_shared_module_helper(self, items, get_phys_index, build):
+    """PortHelper._build_per_chassis of a single chassis device."""
+    self._identified_ports.extend(build(items, self._module_helper))
+
+
+def _measure_build(snmp):
+    port_helper, physical_table = _create_port_helper(snmp)
+    start = time.perf_counter()
+    port_helper.build_ports_structure()
+    elapsed = time.perf_counter() - start
+    structure = [_dump(x) for x in physical_table.physical_chassis_dict.values()]
+    return structure, elapsed
+
+
+def test_ports_built_per_chassis():
+    structure, identified_ports = _build_ports_structure(_create_snmp())
+
+    ports_count = CHASSIS_COUNT * MODULES_PER_CHASSIS * PORTS_PER_MODULE
+    assert len(identified_ports) == ports_count
+    for chassis_id, chassis in enumerate(structure, start=1):
+        ports = _get_ports(chassis)
+        assert len(ports) == MODULES_PER_CHASSIS * PORTS_PER_MODULE
+        assert all(x.startswith(f"Gi{chassis_id}-") for x in ports)
+
+
+def test_per_chassis_benchmark():
+    structure, per_chassis_time = _measure_build(_create_snmp())
+    with patch.object(
+        PortHelper, "_build_per_chassis", _build_with_shared_module_helper
+    ):
+        shared_structure, shared_time = _measure_build(_create_snmp())
+    LOGGER.info(
+        "%s ports of %s chassis built: %.3fs with a module helper per chassis, "
+        "%.3fs with a shared one",
+        CHASSIS_COUNT * MODULES_PER_CHASSIS * PORTS_PER_MODULE,
+        CHASSIS_COUNT,
+        per_chassis_time,
+        shared_time,
+    )
+
+    assert structure == shared_structure
+
+
+def test_network_module_per_switch():
+    structure, _ = _build_ports_structure(_create_stack_snmp())
+
+    modules = [_get_addresses(x, "GenericModule") for x in structure]
+    assert modules == [["CH1/M1"], ["CH2/M2"]]
+    sub_modules = [_get_addresses(x, "GenericSubModule") for x in structure]
+    assert sub_modules == [["CH1/M1/SM1"], ["CH2/M2/SM1"]]
+    assert [_get_ports(x) for x in structure] == [
+        ["Te1-0-1", "Te1-1-1"],
+        ["Te2-0-1", "Te2-1-1"],
+    ]
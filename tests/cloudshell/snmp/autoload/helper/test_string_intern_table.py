@@ -0,0 +1,113 @@
+import logging
+import tracemalloc
+
+from cloudshell.snmp.autoload.helper.string_intern_table import StringInternTable
+from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import BaseEntity
+from cloudshell.snmp.autoload.snmp.entities.snmp_if_entity import SnmpIfEntity
+
+LOGGER = logging.getLogger(__name__)
+ENTITIES_COUNT = 20000
+
+
+class Response:
+    """SnmpResponse stand-in, safe_value builds a new string on every call."""
+
+    def __init__(self, value):
+        self._value = value.encode()
+
+    @property
+    def safe_value(self):
+        return self._value.decode()
+
+
+def _create_rows():
+    """Synthetic device with 20k optics of a few models."""
+    rows = {}
+    for index in range(1, ENTITIES_COUNT + 1):
+        model = f"SFP-10G-{('SR', 'LR', 'ER')[index % 3]}"
+        values = {
+            "entPhysicalParentRelPos": str(index % 48 + 1),
+            "entPhysicalDescr": f"10 Gigabit Ethernet {model} transceiver",
+            "entPhysicalName": f"TenGigabitEthernet{index // 48}/{index % 48}",
+            "entPhysicalContainedIn": str(100000 + index // 48),
+            "entPhysicalClass": "port",
+            "entPhysicalVendorType": "CISCO-ENTITY-VENDORTYPE-OID-MIB::cevPortTe",
+            "entPhysicalModelName": model,
+            "entPhysicalSerialNum": f"FNS{index:08d}",
+            "entPhysicalSoftwareRev": "17.3.1",
+            "entPhysicalHardwareRev": "V01",
+        }
+        rows[str(index)] = {k: Response(v) for k, v in values.items()}
+    return rows
+
+
+def _decode_entities(rows, intern_table):
+    entities = []
+    for index, row in rows.items():
+        entity = BaseEntity(index, row, intern_table)
+        for column in (
+            "position_id",
+            "os_version",
+            "hw_version",
+            "parent_id",
+            "entity_class",
+            "vendor_type_label",
+            "description",
+            "name",
+            "model",
+            "serial_number",
+        ):
+            getattr(entity, column)
+        entities.append(entity)
+    return entities
+
+
+def _measure_peak(rows, intern_table):
+    tracemalloc.start()
+    try:
+        entities = _decode_entities(rows, intern_table)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return entities, peak
+
+
+def test_intern_repeated_values():
+    intern_table = StringInternTable()
+
+    value = intern_table.intern("".join(["ethernet", "Csmacd"]))
+
+    assert intern_table.intern("".join(["ethernet", "Csmacd"])) is value
+    assert intern_table.intern("") == ""
+    assert intern_table.intern(None) is None
+    assert len(intern_table) == 1
+
+
+def test_if_entity_values_interned():
+    intern_table = StringInternTable()
+    row = {"ifType": Response("'ethernetCsmacd'"), "ifSpeed": Response("1000")}
+
+    first = SnmpIfEntity("1", row, intern_table=intern_table)
+    second = SnmpIfEntity("2", dict(row), intern_table=intern_table)
+
+    assert first.if_type == "ethernetCsmacd"
+    assert first.if_type is second.if_type
+    assert first.if_speed is second.if_speed
+
+
+def test_interned_entities_memory_benchmark():
+    rows = _create_rows()
+
+    plain_entities, plain_peak = _measure_peak(rows, None)
+    intern_table = StringInternTable()
+    interned_entities, interned_peak = _measure_peak(rows, intern_table)
+    LOGGER.info(
+        f"{ENTITIES_COUNT} entities decoded: {plain_peak / 2**20:.1f} MiB, "
+        f"{interned_peak / 2**20:.1f} MiB with {len(intern_table)} interned values"
+    )
+
+    assert [(x.model, x.description, x.name) for x in interned_entities] == [
+        (x.model, x.description, x.name) for x in plain_entities
+    ]
+    assert interned_entities[0].model is interned_entities[3].model
+    assert interned_peak < plain_peak * 0.6
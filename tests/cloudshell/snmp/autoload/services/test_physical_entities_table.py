@@ -2,8 +2,11 @@ from copy import deepcopy
 from unittest import TestCase
 from unittest.mock import Mock
 
+import pytest
+
 from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
 from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
 
 from cloudshell.snmp.autoload.services.physical_entities_table import PhysicalTable
 from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
@@ -75,6 +78,34 @@ class TestPhysicalTable(TestCase):
         assert len(self.table.physical_chassis_dict) == 1
         assert len(self.table.physical_power_ports_dict) == 1
 
+    def test_ports_created_on_demand(self):
+        port_index = self.table.physical_ports_list[0]
+        assert port_index not in self.table._physical_structure_table
+        assert not self.table.parent_dict
+
+        port = self.table.get_resource(port_index)
+
+        assert port.name == self.table.get_port_name(port_index)
+        assert port.port_description == self.table.load_entity(port_index).description
+        assert self.table.get_resource(port_index) is port
+        assert self.table.parent_dict[port] == self.table.port_parent_dict[port_index]
+        assert len(self.table.parent_dict) == 1
+        assert self.table.physical_structure_table[port_index] is port
+        assert len(self.table.parent_dict) == 6
+
+    def test_module_created_per_call(self):
+        module_index = self.table.find_parent_module("4117").index
+        module = self.table.create_module(module_index)
+        native_index = module.relative_address.native_index
+        module.relative_address.native_index = "9"
+
+        new_module = self.table.create_module(module_index)
+        assert new_module is not module
+        assert new_module.relative_address.native_index == native_index
+        assert new_module.serial_number == module.serial_number
+        assert self.table.parent_dict[new_module] == self.table.parent_dict[module]
+        assert len(self.table._module_locations) == 1
+
     def test_add_chassis_with_parent_chassis(self):
         response = deepcopy(MOCK_SNMP_RESPONSE)
         response["0"] = {
@@ -91,8 +122,85 @@ class TestPhysicalTable(TestCase):
             "entPhysicalSoftwareRev": Mock(safe_value="8.2.100.0"),
             "entPhysicalHardwareRev": Mock(safe_value=""),
         }
-        response["1"]["entPhysicalContainedIn"] = "0"
+        response["1"]["entPhysicalContainedIn"] = Mock(safe_value="0")
         table = self._prepare_env(response)
 
         result = table.physical_structure_table
         assert result is not None
+        assert set(table.physical_chassis_dict) == {"0", "1"}
+
+    def test_duplicate_chassis_collapsed(self):
+        response = deepcopy(MOCK_SNMP_RESPONSE)
+        response["9999"] = deepcopy(response["1"])
+        response["9999"]["entPhysicalParentRelPos"] = Mock(safe_value="2")
+        table = self._prepare_env(response)
+
+        assert list(table.physical_chassis_dict) == ["1"]
+        assert table.duplicate_chassis_dict == {"9999": "1"}
+        assert not self.table.duplicate_chassis_dict
+
+    def test_entity_table_error_raised_on_join(self):
+        snmp = Mock()
+        snmp.get_multiple_columns.side_effect = ReadSNMPException("genErr")
+        resource_model = NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", Mock()
+        )
+        table = PhysicalTable(SnmpEntityTable(snmp, Mock()), Mock(), resource_model)
+
+        with pytest.raises(ReadSNMPException):
+            table.physical_chassis_dict
+        with pytest.raises(ReadSNMPException):
+            table.snmp_physical_structure_table
+        assert snmp.get_multiple_columns.call_count == 1
+
+    def test_find_parents_in_deep_tree(self):
+        depth = 5000
+        response = {
+            "1": {
+                "entPhysicalParentRelPos": Mock(safe_value="-1"),
+                "entPhysicalName": Mock(safe_value="Chassis"),
+                "entPhysicalContainedIn": Mock(safe_value="0"),
+                "entPhysicalClass": Mock(safe_value="chassis"),
+                "entPhysicalVendorType": Mock(safe_value="cevChassis"),
+            }
+        }
+        for index in range(2, depth):
+            response[str(index)] = {
+                "entPhysicalParentRelPos": Mock(safe_value="1"),
+                "entPhysicalContainedIn": Mock(safe_value=str(index - 1)),
+                "entPhysicalClass": Mock(safe_value="port"),
+                "entPhysicalVendorType": Mock(safe_value="cevPort"),
+            }
+        table = self._prepare_env(response)
+
+        assert table.get_parent_chassis(str(depth - 1)).index == "1"
+        assert table.find_parent_module(str(depth - 1)).index == "1"
+        assert table._find_parent_containers(str(depth - 1)) is None
+        assert len(table.containment_index.children["1"]) == 1
+
+    def test_pick_port_name(self):
+        response = deepcopy(MOCK_SNMP_RESPONSE)
+        response["2050"]["entPhysicalDescr"] = Mock(safe_value="Transceiver Port")
+        response["2037"]["entPhysicalName"] = Mock(safe_value="Gi6/1")
+        response["2037"]["entPhysicalDescr"] = Mock(safe_value="Transceiver Port")
+        table = self._prepare_env(response)
+
+        assert table._pick_port_name(table.load_entity("4093")) == (
+            "GigabitEthernet8-0-0"
+        )
+        assert table._pick_port_name(table.load_entity("2024")) == (
+            "Transceiver Port Gi6-1"
+        )
+        assert table._pick_port_name(table.load_entity("2037")) == "Port"
+
+    def test_irrelevant_entities_dropped_at_ingestion(self):
+        sensor_index = "21"
+        excluded_module_index = "4012"
+        _ = self.table.physical_structure_table
+        _ = self.table.containment_index
+
+        assert len(self.table._ingested_entities) == 69
+        assert sensor_index not in self.table._entities
+        assert excluded_module_index not in self.table._entities
+        assert self.table.containment_index.get_parent(sensor_index) is None
+        assert self.table.find_parent_module("4117").index == "4015"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import bisect
+from contextlib import contextmanager
+from threading import Thread
+
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.entity import config, engine
+from pysnmp.entity.rfc3413 import cmdrsp, context
+from pysnmp.proto import rfc1902, rfc1905
+from pysnmp.smi import instrum
+
+
+class TableMibInstrumController(instrum.AbstractMibInstrumController):
+    """Answers GET, GETNEXT and GETBULK requests from a dict of OID values."""
+
+    def __init__(self, values: dict[tuple[int, ...], object]):
+        self._values = values
+        self._oids = sorted(values)
+
+    def readVars(self, varBinds, acInfo=(None, None)):  # noqa: N802, N803
+        return [
+            (oid, self._values.get(tuple(oid), rfc1905.noSuchInstance))
+            for oid, _ in varBinds
+        ]
+
+    def readNextVars(self, varBinds, acInfo=(None, None)):  # noqa: N802, N803
+        result = []
+        for oid, _ in varBinds:
+            position = bisect.bisect_right(self._oids, tuple(oid))
+            if position < len(self._oids):
+                next_oid = self._oids[position]
+                result.append((rfc1902.ObjectName(next_oid), self._values[next_oid]))
+            else:
+                result.append((oid, rfc1905.endOfMibView))
+        return result
+
+
+@contextmanager
+def snmp_agent(values: dict[tuple[int, ...], object], community: str = "public"):
+    """SNMPv2c agent on a free local UDP port, yields the port."""
+    snmp_engine = engine.SnmpEngine()
+    transport = udp.UdpTransport().openServerMode(("127.0.0.1", 0))
+    config.addTransport(snmp_engine, udp.domainName, transport)
+    config.addV1System(snmp_engine, "agent-area", community)
+    config.addVacmUser(snmp_engine, 2, "agent-area", "noAuthNoPriv", (1,))
+    snmp_context = context.SnmpContext(snmp_engine)
+    snmp_context.unregisterContextName(rfc1902.OctetString(""))
+    snmp_context.registerContextName(
+        rfc1902.OctetString(""), TableMibInstrumController(values)
+    )
+    cmdrsp.GetCommandResponder(snmp_engine, snmp_context)
+    cmdrsp.NextCommandResponder(snmp_engine, snmp_context)
+    cmdrsp.BulkCommandResponder(snmp_engine, snmp_context)
+    dispatcher = snmp_engine.transportDispatcher
+    dispatcher.jobStarted(1)
+    thread = Thread(target=dispatcher.runDispatcher, name="SNMP agent")
+    thread.start()
+    try:
+        yield transport.socket.getsockname()[1]
+    finally:
+        dispatcher.jobFinished(1)
+        thread.join()
+        dispatcher.closeDispatcher()
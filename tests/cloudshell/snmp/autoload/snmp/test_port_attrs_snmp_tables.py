@@ -0,0 +1,409 @@
+import logging
+from threading import Event, Thread
+from unittest.mock import Mock
+
+import pytest
+from pysnmp.proto import rfc1902
+
+from cloudshell.snmp.cloudshell_snmp import Snmp
+from cloudshell.snmp.core.domain.snmp_oid import SnmpMibObject
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
+from cloudshell.snmp.snmp_parameters import SNMPReadParameters
+
+from .snmp_agent import snmp_agent
+
+from cloudshell.snmp.autoload.constants import discovery_profiles
+from cloudshell.snmp.autoload.exceptions.snmp_autoload_error import GeneralAutoloadError
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_associated_ports import (
+    PortChannelsAssociatedPorts,
+)
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_ports_auto_negotioation import (
+    PortAutoNegotiation,
+)
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_ports_duplex_table import (
+    PortDuplex,
+)
+from cloudshell.snmp.autoload.snmp.tables.port_attrs_snmp_tables.snmp_service_interface import (
+    PortAttributesServiceInterface,
+)
+from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
+
+IF_NUMBER = 60000
+
+
+def _create_snmp():
+    """Device where every interface has a value in every table."""
+
+    def get_list(oids):
+        values = {
+            "dot3StatsIndex": lambda x: x,
+            "dot3StatsDuplexStatus": lambda x: "'fullDuplex'",
+            "ifMauAutoNegAdminStatus": lambda x: "'enabled'",
+            "dot3adAggPortAttachedAggID": lambda x: "1000",
+        }
+        return [
+            Mock(
+                index=oid.index,
+                mib_id=oid.object_name,
+                safe_value=values[oid.object_name](oid.index),
+            )
+            for oid in oids
+        ]
+
+    snmp = Mock()
+    snmp.get_list.side_effect = get_list
+    return snmp
+
+
+def test_few_ports_loaded_with_get_requests():
+    snmp = _create_snmp()
+    logger = Mock()
+    duplex = PortDuplex(snmp, logger)
+    auto_neg = PortAutoNegotiation(snmp, logger)
+    associated_ports = PortChannelsAssociatedPorts(snmp, logger)
+    for table in (duplex, auto_neg, associated_ports):
+        table.set_if_indexes(["5", "7"], IF_NUMBER)
+        table.load_snmp_table()
+
+    snmp.get_multiple_columns.assert_not_called()
+    snmp.get_table.assert_not_called()
+    assert duplex.get_duplex_by_port_index("7") == "Full"
+    assert auto_neg.get_value_by_index("7") == "True"
+    assert associated_ports.get_associated_ports("1000") == ["5", "7"]
+    requested = {oid.index for c in snmp.get_list.call_args_list for oid in c[0][0]}
+    assert requested == {"5", "7", "5.1", "7.1"}
+    assert "GET rows of 2 interfaces" in logger.info.call_args_list[0][0][0]
+
+
+def test_tables_walked_after_get_error():
+    snmp = _create_snmp()
+    snmp.get_list.side_effect = ReadSNMPException("Remote SNMP error tooBig")
+    snmp.get_multiple_columns.return_value = {
+        "7": {
+            "dot3StatsIndex": Mock(safe_value="7"),
+            "dot3StatsDuplexStatus": Mock(safe_value="'fullDuplex'"),
+        }
+    }
+    snmp.get_table.return_value = {
+        "7": {"dot3adAggPortAttachedAggID": Mock(safe_value="1000")}
+    }
+    logger = Mock()
+    duplex = PortDuplex(snmp, logger)
+    associated_ports = PortChannelsAssociatedPorts(snmp, logger)
+    for table in (duplex, associated_ports):
+        table.set_if_indexes(["5", "7"], IF_NUMBER)
+        table.load_snmp_table()
+
+    assert duplex.get_duplex_by_port_index("7") == "Full"
+    assert associated_ports.get_associated_ports("1000") == ["7"]
+    assert snmp.get_list.call_count == 2
+
+
+def test_auto_negotiation_walked_for_other_mau_index():
+    snmp = Mock()
+    snmp.get_list.side_effect = lambda oids: [
+        Mock(index=x.index, mib_id=x.object_name, safe_value="'enabled'")
+        for x in oids
+        if x.index == "5.1"
+    ]
+    snmp.get_table.return_value = {
+        "5.1": {"ifMauAutoNegAdminStatus": Mock(safe_value="'enabled'")},
+        "7.2": {"ifMauAutoNegAdminStatus": Mock(safe_value="'enabled'")},
+    }
+    auto_neg = PortAutoNegotiation(snmp, Mock())
+    auto_neg.set_if_indexes(["5", "7"], IF_NUMBER)
+
+    auto_neg.load_snmp_table()
+
+    snmp.get_table.assert_called_once()
+    assert auto_neg.get_value_by_index("7") == "True"
+
+
+def test_most_ports_walked():
+    snmp = _create_snmp()
+    snmp.get_multiple_columns.return_value = {}
+    logger = Mock()
+    duplex = PortDuplex(snmp, logger)
+
+    duplex.set_if_indexes([str(x) for x in range(1, IF_NUMBER // 10)], IF_NUMBER)
+    duplex.load_snmp_table()
+
+    snmp.get_list.assert_not_called()
+    snmp.get_multiple_columns.assert_called_once()
+    assert "walking ~60000 rows" in logger.info.call_args_list[0][0][0]
+
+
+def test_ports_of_subtree_estimated_by_if_number():
+    snmp = _create_snmp()
+    snmp.get_property.return_value = Mock(safe_value=str(IF_NUMBER))
+    ports_snmp_table = SnmpPortsTable(snmp, Mock())
+    ports_snmp_table.set_if_indexes(["5", "7"])
+    ports_snmp_table._port_table = {"5": {}, "7": {}}
+
+    ports_snmp_table.set_port_indexes(["5", "7"])
+
+    assert ports_snmp_table.port_duplex.get_duplex_by_port_index("5") == "Full"
+    snmp.get_multiple_columns.assert_not_called()
+
+
+def test_port_channels_not_requested_from_port_tables():
+    snmp = _create_snmp()
+    get_list = snmp.get_list.side_effect
+    # port channels have no EtherLike-MIB and MAU-MIB rows
+    snmp.get_list.side_effect = lambda oids: [
+        x for x in get_list(oids) if x.index.split(".")[0] != "100"
+    ]
+    snmp.get_property.return_value = Mock(safe_value=str(IF_NUMBER))
+    snmp.walk.return_value = []
+    ports_snmp_table = SnmpPortsTable(snmp, Mock())
+    ports_snmp_table.set_if_indexes(["5", "7", "100"])
+    ports_snmp_table._port_table = {"5": {}, "7": {}, "100": {}}
+    ports_snmp_table.set_port_indexes(["5", "7", "100"], port_channel_indexes=["100"])
+
+    attributes = ports_snmp_table.get_port_attributes("7")
+
+    assert (attributes.duplex, attributes.auto_negotiation) == ("Full", "True")
+    requested = {oid.index for c in snmp.get_list.call_args_list for oid in c[0][0]}
+    assert requested == {"5", "7", "100", "5.1", "7.1"}
+    snmp.get_table.assert_not_called()
+    snmp.get_multiple_columns.assert_not_called()
+
+
+def test_port_attributes_joined_in_single_pass():
+    snmp = Mock()
+    snmp.walk.side_effect = lambda oid: (
+        [Mock(safe_value="5", index="10.0.0.1")]
+        if oid.object_name == "ipAdEntIfIndex"
+        else []
+    )
+    snmp.get_multiple_columns.return_value = {
+        "5": {
+            "dot3StatsIndex": Mock(safe_value="5"),
+            "dot3StatsDuplexStatus": Mock(safe_value="'fullDuplex'"),
+        }
+    }
+    snmp.get_table.return_value = {}
+    ports_snmp_table = SnmpPortsTable(snmp, Mock())
+    ports_snmp_table._port_table = {"5": {}, "7": {}}
+    ports_snmp_table.set_port_indexes(["5", "7"], port_channel_indexes=[])
+
+    attributes = ports_snmp_table.get_port_attributes("5")
+
+    assert list(ports_snmp_table._port_attributes) == ["5", "7"]
+    assert attributes.associated_ports is None
+    assert (
+        ports_snmp_table._port_channel_associated_ports
+        not in ports_snmp_table._scheduler._threads
+    )
+    assert ports_snmp_table.get_port_attributes("5") is attributes
+    assert (attributes.ipv4_address, attributes.duplex) == ("10.0.0.1", "Full")
+    assert attributes.auto_negotiation == "False"
+    assert ports_snmp_table.get_port_attributes("7").duplex is None
+    assert not ports_snmp_table.port_ip_table._thread_list
+    assert not ports_snmp_table.port_duplex._thread_list
+
+
+def test_port_channel_attributes_joined_without_port_tables():
+    snmp = _create_empty_snmp()
+    snmp.get_table.return_value = {
+        "5": {"dot3adAggPortAttachedAggID": Mock(safe_value="100")}
+    }
+    ports_snmp_table = SnmpPortsTable(snmp, Mock())
+    ports_snmp_table._port_table = {"5": {}, "100": {}}
+
+    attributes = ports_snmp_table.get_port_channel_attributes("100")
+
+    assert attributes.associated_ports == ["5"]
+    assert (attributes.duplex, attributes.auto_negotiation) == (None, None)
+    # interfaces are unknown without set_port_indexes, only this one is joined
+    assert list(ports_snmp_table._port_channel_attributes) == ["100"]
+    assert ports_snmp_table._port_attributes is None
+    snmp.get_multiple_columns.assert_not_called()
+
+
+def _create_empty_snmp():
+    snmp = Mock()
+    snmp.walk.return_value = []
+    snmp.get_table.return_value = {}
+    snmp.get_multiple_columns.return_value = {}
+    return snmp
+
+
+class PortPoe(PortAttributesServiceInterface):
+    MIB_OBJECTS = [SnmpMibObject("POWER-ETHERNET-MIB", "pethPsePortDetectionStatus")]
+    PORT_FIELDS = ("poe_status",)
+
+    def __init__(self, snmp_service, logger):
+        super().__init__(snmp_service, logger)
+        self._status = {}
+
+    def load_snmp_table(self):
+        self._status = {"5": "deliveringPower"}
+
+    def set_port_attributes(self, port_object, port):
+        port_object.poe_status = self._status.get(port.if_index)
+
+
+def _create_agent_values(ports_count):
+    """Ethernet ports with an IP address, every port is in port channel 1000."""
+    values = {}
+    for index in range(1, ports_count + 1):
+        for oid, value in (
+            # IF-MIB ifDescr, ifType and ifName
+            ((1, 3, 6, 1, 2, 1, 2, 2, 1, 2, index), rfc1902.OctetString(f"Gi{index}")),
+            ((1, 3, 6, 1, 2, 1, 2, 2, 1, 3, index), rfc1902.Integer(6)),
+            ((1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 1, index), rfc1902.OctetString("")),
+            # EtherLike-MIB dot3StatsIndex and dot3StatsDuplexStatus fullDuplex
+            ((1, 3, 6, 1, 2, 1, 10, 7, 2, 1, 1, index), rfc1902.Integer(index)),
+            ((1, 3, 6, 1, 2, 1, 10, 7, 2, 1, 19, index), rfc1902.Integer(3)),
+            # IP-MIB ipAdEntIfIndex of 10.0.x.y
+            (
+                (1, 3, 6, 1, 2, 1, 4, 20, 1, 2, 10, 0, index // 256, index % 256),
+                rfc1902.Integer(index),
+            ),
+            # MAU-MIB ifMauAutoNegAdminStatus enabled
+            ((1, 3, 6, 1, 2, 1, 26, 5, 1, 1, 1, index, 1), rfc1902.Integer(1)),
+            # IEEE8023-LAG-MIB dot3adAggPortAttachedAggID
+            ((1, 2, 840, 10006, 300, 43, 1, 2, 1, 1, 13, index), rfc1902.Integer(1000)),
+        ):
+            values[oid] = value
+    return values
+
+
+def _load_port_attributes(snmp_service, logger, result):
+    try:
+        ports_snmp_table = SnmpPortsTable(snmp_service, logger)
+        ports_snmp_table.start_loading()
+        # walked while IP and LLDP tables are loaded
+        if_indexes = list(ports_snmp_table.port_table)
+        ports_snmp_table.set_port_indexes(if_indexes, port_channel_indexes=[])
+        result["attributes"] = {
+            x: ports_snmp_table.get_port_attributes(x) for x in if_indexes
+        }
+        result["associated_ports"] = ports_snmp_table.port_channel_associated_ports
+    except Exception as e:
+        result["error"] = e
+
+
+def test_providers_loaded_concurrently_on_shared_snmp_service():
+    ports_count = 300
+    logger = logging.getLogger(__name__)
+    result = {}
+    with snmp_agent(_create_agent_values(ports_count)) as port:
+        snmp_parameters = SNMPReadParameters("127.0.0.1", "public", "2", port=port)
+        with Snmp().get_snmp_service(snmp_parameters, logger) as snmp_service:
+            # concurrent dispatchers of the engine can spin forever, threads
+            # started by a daemon thread are daemons as well
+            thread = Thread(
+                target=_load_port_attributes,
+                args=(snmp_service, logger, result),
+                daemon=True,
+            )
+            thread.start()
+            thread.join(60)
+
+    assert not thread.is_alive()
+    if "error" in result:
+        raise result["error"]
+    attributes, associated_ports = result["attributes"], result["associated_ports"]
+    if_indexes = list(attributes)
+    assert len(if_indexes) == ports_count
+    assert {(x.duplex, x.auto_negotiation) for x in attributes.values()} == {
+        ("Full", "True")
+    }
+    assert attributes["300"].ipv4_address == "10.0.1.44"
+    assert sorted(associated_ports.get_associated_ports("1000")) == sorted(if_indexes)
+
+
+def test_registered_provider_fills_port():
+    class SnmpPortsTableWithPoe(SnmpPortsTable):
+        PORT_ATTRIBUTES_PROVIDERS = [PortPoe]
+
+    ports_snmp_table = SnmpPortsTableWithPoe(_create_empty_snmp(), Mock())
+    port_object = Mock()
+
+    for provider in ports_snmp_table.registered_providers:
+        provider.set_port_attributes(port_object, Mock(if_index="5"))
+
+    assert port_object.poe_status == "deliveringPower"
+
+
+def test_provider_load_error_raised_on_wait():
+    snmp = _create_empty_snmp()
+    snmp.get_multiple_columns.side_effect = TimeoutError("No SNMP response")
+    ports_snmp_table = SnmpPortsTable(snmp, Mock())
+    ports_snmp_table.start_loading()
+
+    with pytest.raises(TimeoutError):
+        ports_snmp_table.port_duplex
+
+
+def test_compact_waits_for_unread_providers():
+    release = Event()
+
+    class SlowPortPoe(PortPoe):
+        def load_snmp_table(self):
+            release.wait(10)
+            super().load_snmp_table()
+
+    provider = SlowPortPoe(_create_empty_snmp(), Mock())
+    ports_snmp_table = SnmpPortsTable(_create_empty_snmp(), Mock())
+    ports_snmp_table.register_provider(provider)
+    ports_snmp_table.start_loading()
+
+    compact = Thread(target=ports_snmp_table.compact, daemon=True)
+    compact.start()
+    compact.join(0.2)
+    assert compact.is_alive()
+    release.set()
+    compact.join(10)
+
+    assert not compact.is_alive()
+    assert provider._status == {"5": "deliveringPower"}
+
+
+def test_minimal_profile_fetches_no_attribute_tables():
+    snmp = _create_empty_snmp()
+    ports_snmp_table = SnmpPortsTable(snmp, Mock())
+    ports_snmp_table.register_provider(PortPoe(snmp, Mock()))
+    ports_snmp_table._port_table = {"5": {}}
+    ports_snmp_table.set_profile(discovery_profiles.MINIMAL)
+
+    ports_snmp_table.start_loading()
+    ports_snmp_table.set_port_indexes(["5"])
+    attributes = ports_snmp_table.get_port_attributes("5")
+
+    assert not ports_snmp_table.port_fields
+    assert not ports_snmp_table.registered_providers
+    assert (attributes.duplex, attributes.auto_negotiation) == (None, None)
+    snmp.walk.assert_not_called()
+    snmp.get_table.assert_not_called()
+    snmp.get_multiple_columns.assert_not_called()
+
+
+def test_standard_profile_skips_lldp_and_mau_tables():
+    ports_snmp_table = SnmpPortsTable(_create_empty_snmp(), Mock())
+    ports_snmp_table._port_table = {"5": {}}
+    ports_snmp_table.set_profile(discovery_profiles.STANDARD)
+
+    ports_snmp_table.start_loading()
+    ports_snmp_table.set_port_indexes(["5"])
+    attributes = ports_snmp_table.get_port_attributes("5")
+
+    assert set(ports_snmp_table._scheduler._threads) == {
+        ports_snmp_table._port_ip_tables,
+        ports_snmp_table._port_duplex,
+        ports_snmp_table._port_channel_associated_ports,
+    }
+    assert ports_snmp_table.port_fields == {
+        "ipv4_address",
+        "ipv6_address",
+        "duplex",
+        "associated_ports",
+    }
+    assert attributes.auto_negotiation is None
+
+
+def test_unknown_profile():
+    with pytest.raises(GeneralAutoloadError):
+        SnmpPortsTable(Mock(), Mock()).set_profile("fast")
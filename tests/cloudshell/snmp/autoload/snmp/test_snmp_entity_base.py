@@ -0,0 +1,88 @@
+from unittest.mock import Mock, patch
+
+from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+
+from cloudshell.snmp.autoload.constants.entity_constants import (
+    ENTITY_TABLE_REQUIRED_COLUMNS,
+)
+from cloudshell.snmp.autoload.services.physical_entities_table import PhysicalTable
+from cloudshell.snmp.autoload.snmp.entities.snmp_entity_base import BaseEntity
+from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
+
+ROWS_COUNT = 10000
+
+
+class CountingResponse:
+    """SnmpResponse stand-in counting how many times its value is decoded."""
+
+    decodes = 0
+
+    def __init__(self, value):
+        self._value = value
+
+    @property
+    def safe_value(self):
+        CountingResponse.decodes += 1
+        return self._value
+
+
+def _create_row(parent_id, position, entity_class, vendor_type, name):
+    values = {
+        "entPhysicalParentRelPos": position,
+        "entPhysicalDescr": f"{name} description",
+        "entPhysicalName": name,
+        "entPhysicalContainedIn": parent_id,
+        "entPhysicalClass": entity_class,
+        "entPhysicalVendorType": vendor_type,
+        "entPhysicalModelName": "MODEL-1",
+        "entPhysicalSerialNum": f"SN{name}",
+        "entPhysicalSoftwareRev": "1.0",
+        "entPhysicalHardwareRev": "",
+    }
+    return {k: CountingResponse(v) for k, v in values.items()}
+
+
+def _create_physical_table():
+    data = QualiMibTable("entPhysicalTable")
+    data["1"] = _create_row("0", "-1", "chassis", "cevChassis", "Chassis")
+    for index in range(2, ROWS_COUNT + 1):
+        if index % 10:
+            row = _create_row("1", str(index), "sensor", "cevSensor", f"s{index}")
+        else:
+            row = _create_row("1", str(index), "port", "cevPort", f"Gi0/{index}")
+        data[str(index)] = row
+    snmp = Mock()
+    snmp.get_multiple_columns.return_value = data
+    resource_model = NetworkingResourceModel(
+        "Resource Name", "Shell Name", "CS_Switch", Mock()
+    )
+    return PhysicalTable(SnmpEntityTable(snmp, Mock()), Mock(), resource_model)
+
+
+def test_entity_is_slotted():
+    entity = BaseEntity("1", {})
+
+    assert not hasattr(entity, "__dict__")
+    assert entity.name == ""
+
+
+def test_entity_rows_decoded_once_benchmark():
+    CountingResponse.decodes = 0
+    with patch(
+        f"{PhysicalTable.__module__}.BaseEntity", wraps=BaseEntity
+    ) as entity_class:
+        table = _create_physical_table()
+        _ = table.physical_structure_table
+        for _ in range(3):
+            for index in table.entity_table.physical_structure_snmp_table:
+                entity = table.load_entity(index)
+                _ = (entity.name, entity.description, entity.vendor_type_label)
+                _ = (entity.entity_class, entity.model, entity.serial_number)
+                _ = table.find_parent_module(index)
+
+    assert entity_class.call_count == ROWS_COUNT
+    # entPhysicalContainedIn is decoded by the SnmpEntityTable as well
+    assert CountingResponse.decodes <= (len(ENTITY_TABLE_REQUIRED_COLUMNS) + 1) * (
+        ROWS_COUNT
+    )
@@ -0,0 +1,217 @@
+from copy import deepcopy
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
+
+from cloudshell.snmp.autoload.constants.entity_constants import (
+    ENTITY_TABLE_CLASSIFICATION_COLUMNS,
+)
+from cloudshell.snmp.autoload.helper.entity_helper import EntityHelper
+from cloudshell.snmp.autoload.services.physical_entities_table import PhysicalTable
+from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
+
+from tests.cloudshell.snmp.autoload.data.physical_entities_data import (
+    MOCK_SNMP_RESPONSE,
+)
+
+
+class TestSnmpEntityTable(TestCase):
+    def _create_snmp(self, classification_columns=None):
+        data = deepcopy(MOCK_SNMP_RESPONSE)
+        if classification_columns is None:
+            classification_columns = [
+                column.object_name for column in ENTITY_TABLE_CLASSIFICATION_COLUMNS
+            ]
+
+        def get_multiple_columns(columns):
+            names = {column.object_name for column in columns}
+            table = QualiMibTable("entPhysicalTable")
+            for index, row in data.items():
+                table[index] = {k: v for k, v in row.items() if k in names}
+            return table
+
+        def get_list(oids):
+            return [
+                Mock(
+                    index=oid.index,
+                    mib_id=oid.object_name,
+                    safe_value=data[oid.index][oid.object_name].safe_value,
+                )
+                for oid in oids
+                if oid.object_name in data[oid.index]
+                and oid.object_name not in classification_columns
+            ]
+
+        snmp = Mock()
+        snmp.get_multiple_columns.side_effect = get_multiple_columns
+        snmp.get_list.side_effect = get_list
+        return snmp
+
+    def _create_physical_table(self, entity_table):
+        resource_model = NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", Mock()
+        )
+        return PhysicalTable(entity_table, Mock(), resource_model)
+
+    def test_selective_retrieval_skips_irrelevant_entities(self):
+        snmp = self._create_snmp()
+        entity_table = SnmpEntityTable(snmp, Mock(), selective_retrieval=True)
+
+        table = entity_table.physical_structure_snmp_table
+
+        requested = {oid.index for c in snmp.get_list.call_args_list for oid in c[0][0]}
+        assert len(table) == len(MOCK_SNMP_RESPONSE)
+        assert all(
+            MOCK_SNMP_RESPONSE[index]["entPhysicalClass"].safe_value
+            not in ("sensor", "fan")
+            for index in requested
+        )
+        assert "entPhysicalModelName" in table["1"]
+        assert "entPhysicalModelName" not in table["21"]
+
+    def test_selective_retrieval_builds_same_structure(self):
+        full_table = self._create_physical_table(
+            SnmpEntityTable(self._create_snmp(), Mock())
+        )
+        selective_table = self._create_physical_table(
+            SnmpEntityTable(self._create_snmp(), Mock(), selective_retrieval=True)
+        )
+
+        assert selective_table.physical_ports_list == full_table.physical_ports_list
+        assert [
+            (x.name, x.model, x.serial_number)
+            for x in selective_table.physical_chassis_dict.values()
+        ] == [
+            (x.name, x.model, x.serial_number)
+            for x in full_table.physical_chassis_dict.values()
+        ]
+        assert list(selective_table.physical_power_ports_dict) == list(
+            full_table.physical_power_ports_dict
+        )
+
+    def test_selective_retrieval_streams_loaded_rows(self):
+        snmp = self._create_snmp()
+        get_list = snmp.get_list.side_effect
+        entity_table = SnmpEntityTable(snmp, Mock(), selective_retrieval=True)
+        rows = []
+
+        def track_get_list(oids):
+            track_get_list.loaded_rows.append(len(rows))
+            return get_list(oids)
+
+        track_get_list.loaded_rows = []
+        snmp.get_list.side_effect = track_get_list
+
+        for index, row in entity_table.iter_physical_structure_snmp_table():
+            rows.append(index)
+
+        assert len(track_get_list.loaded_rows) > 1
+        assert track_get_list.loaded_rows[-1] > track_get_list.loaded_rows[0]
+        assert sorted(rows) == sorted(MOCK_SNMP_RESPONSE)
+        assert list(entity_table.physical_structure_snmp_table) == list(
+            MOCK_SNMP_RESPONSE
+        )
+        assert snmp.get_multiple_columns.call_count == 1
+
+    def test_selective_retrieval_skips_failed_batch(self):
+        snmp = self._create_snmp()
+        get_list = snmp.get_list.side_effect
+
+        def get_list_failing_first_batch(oids):
+            if snmp.get_list.call_count == 1:
+                raise ReadSNMPException("Remote SNMP error genErr")
+            return get_list(oids)
+
+        snmp.get_list.side_effect = get_list_failing_first_batch
+        logger = Mock()
+        entity_table = SnmpEntityTable(snmp, logger, selective_retrieval=True)
+
+        table = entity_table.physical_structure_snmp_table
+
+        batch_size = SnmpEntityTable.GET_BATCH_SIZE
+        assert all(len(c[0][0]) <= batch_size for c in snmp.get_list.call_args_list)
+        assert len(table) == len(MOCK_SNMP_RESPONSE)
+        assert "genErr" in logger.error.call_args[0][0]
+
+    def test_iteration_stopped_early_doesnt_block_table(self):
+        snmp = self._create_snmp()
+        entity_table = SnmpEntityTable(snmp, Mock(), selective_retrieval=True)
+        rows = entity_table.iter_physical_structure_snmp_table()
+        first_index, _ = next(rows)
+
+        table = entity_table.physical_structure_snmp_table
+
+        assert list(table) == list(MOCK_SNMP_RESPONSE)
+        assert sorted([first_index] + [index for index, _ in rows]) == sorted(table)
+        assert snmp.get_multiple_columns.call_count == 1
+
+    def test_table_loaded_again_after_error(self):
+        snmp = self._create_snmp()
+        get_multiple_columns = snmp.get_multiple_columns.side_effect
+        snmp.get_multiple_columns.side_effect = [
+            ReadSNMPException("Remote SNMP error genErr"),
+            get_multiple_columns(ENTITY_TABLE_CLASSIFICATION_COLUMNS),
+        ]
+        entity_table = SnmpEntityTable(snmp, Mock(), selective_retrieval=True)
+
+        with self.assertRaises(ReadSNMPException):
+            entity_table.physical_structure_snmp_table
+        table = entity_table.physical_structure_snmp_table
+
+        assert list(table) == list(MOCK_SNMP_RESPONSE)
+
+    def test_entities_classified_while_table_is_loaded(self):
+        snmp = self._create_snmp()
+        get_list = snmp.get_list.side_effect
+        entity_helper = Mock(wraps=EntityHelper())
+        classified = []
+
+        def track_get_list(oids):
+            classified.append(entity_helper.get_physical_class.call_count)
+            return get_list(oids)
+
+        snmp.get_list.side_effect = track_get_list
+        resource_model = NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", Mock()
+        )
+        physical_table = PhysicalTable(
+            SnmpEntityTable(snmp, Mock(), selective_retrieval=True),
+            Mock(),
+            resource_model,
+            entity_helper,
+        )
+
+        assert physical_table.physical_ports_list
+        assert classified[0] == 0
+        assert classified[-1] > 0
+
+    def test_subtree_retrieval(self):
+        snmp = self._create_snmp(classification_columns=[])
+        full_table = self._create_physical_table(
+            SnmpEntityTable(self._create_snmp(), Mock())
+        )
+        entity_table = SnmpEntityTable(snmp, Mock(), root_index="2000")
+
+        subtree_table = self._create_physical_table(entity_table)
+        ports = subtree_table.physical_ports_list
+
+        requested = {oid.index for c in snmp.get_list.call_args_list for oid in c[0][0]}
+        subtree_indexes = set(entity_table.subtree_indexes)
+        assert entity_table.subtree_indexes[0] == "2000"
+        assert {"2024", "2037", "2050"} <= subtree_indexes
+        assert requested == subtree_indexes | {"7", "1"}
+        assert sorted(ports) == sorted(
+            x for x in full_table.physical_ports_list if x in subtree_indexes
+        )
+        assert list(subtree_table.physical_chassis_dict) == ["1"]
+        assert subtree_table.find_parent_module("2024").index == "2000"
+
+    def test_subtree_retrieval_unknown_root(self):
+        snmp = self._create_snmp()
+        entity_table = SnmpEntityTable(snmp, Mock(), root_index="100500")
+
+        assert not entity_table.physical_structure_snmp_table
+        snmp.get_list.assert_not_called()
@@ -0,0 +1,70 @@
+from unittest.mock import Mock
+
+from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+
+from cloudshell.snmp.autoload.services.port_table import PortsTable
+from cloudshell.snmp.autoload.snmp.entities.snmp_if_entity import SnmpIfEntity
+from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
+
+ROWS_COUNT = 1000
+
+
+class CountingResponse:
+    """SnmpResponse stand-in counting how many times its value is decoded."""
+
+    decodes = 0
+
+    def __init__(self, value):
+        self._value = value
+
+    @property
+    def safe_value(self):
+        CountingResponse.decodes += 1
+        return self._value
+
+
+def _create_ports_table():
+    data = QualiMibTable("ifTable")
+    for index in range(1, ROWS_COUNT + 1):
+        values = {
+            "ifDescr": f"GigabitEthernet0/{index}",
+            "ifType": "'ethernetCsmacd'",
+            "ifMtu": "1500",
+            "ifHighSpeed": "1000",
+        }
+        data[str(index)] = {k: CountingResponse(v) for k, v in values.items()}
+    snmp = Mock()
+    snmp.get_multiple_columns.return_value = data
+    snmp.get_table.return_value = {}
+    resource_model = NetworkingResourceModel(
+        "Resource Name", "Shell Name", "CS_Switch", Mock()
+    )
+    return PortsTable(resource_model, SnmpPortsTable(snmp, Mock()), Mock())
+
+
+def test_if_entity_is_slotted():
+    entity = SnmpIfEntity("1", {"ifType": CountingResponse("'ieee8023adLag'")})
+
+    assert not hasattr(entity, "__dict__")
+    assert entity.if_type == "ieee8023adLag"
+    assert entity.port_name == ""
+    assert entity.port_id is None
+    assert entity.if_mac is None
+
+
+def test_if_rows_decoded_once_benchmark():
+    CountingResponse.decodes = 0
+    table = _create_ports_table()
+    table._if_entity = Mock(wraps=SnmpIfEntity)
+
+    ports = table.ports_dict
+    for _ in range(3):
+        for index in ports:
+            port = table.load_if_port(index)
+            _ = (port.port_name, port.port_id, port.if_type, port.if_mtu)
+            _ = (port.if_mac, port.if_speed, port.if_port_description)
+
+    assert len(ports) == ROWS_COUNT
+    assert table._if_entity.call_count == ROWS_COUNT
+    assert CountingResponse.decodes == 4 * ROWS_COUNT
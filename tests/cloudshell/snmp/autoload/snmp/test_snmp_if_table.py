@@ -1,12 +1,20 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.snmp_errors import ReadSNMPException
 
 from .port_snmp_data import PORT_SNMP_DATA
 
+from cloudshell.snmp.autoload.constants.port_constants import (
+    IF_TABLE_CLASSIFICATION_COLUMNS,
+)
+from cloudshell.snmp.autoload.helper.interface_classifier import InterfaceClassifier
 from cloudshell.snmp.autoload.services.port_table import PortsTable
+from cloudshell.snmp.autoload.snmp.tables.snmp_port_mapping_table import (
+    SnmpPortMappingTable,
+)
 from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
 
 API = Mock(
@@ -36,3 +44,208 @@ def test_if_ports_table(resource_model):
     ports = if_table.ports_dict
     port_name = port_value["ifDescr"].safe_value.replace("/", "-")
     assert port_name == ports.get(index).name
+
+
+def test_if_ports_table_for_selected_interfaces():
+    logger = Mock()
+    snmp = Mock()
+    index = "527304960"
+    snmp.get_list.side_effect = lambda oids: [
+        Mock(
+            index=oid.index,
+            mib_id=oid.object_name,
+            safe_value=PORT_SNMP_DATA[oid.index][oid.object_name].safe_value,
+        )
+        for oid in oids
+        if oid.object_name in PORT_SNMP_DATA[oid.index]
+    ]
+    ports_snmp_table = SnmpPortsTable(snmp, logger)
+    ports_snmp_table.set_if_indexes([index])
+
+    port_table = ports_snmp_table.port_table
+
+    snmp.get_multiple_columns.assert_not_called()
+    assert list(port_table) == [index]
+    assert port_table[index]["ifDescr"].safe_value == (
+        PORT_SNMP_DATA[index]["ifDescr"].safe_value
+    )
+
+
+def test_if_table_classified_once_without_port_channels():
+    logger = Mock()
+    snmp = Mock()
+    snmp.get_multiple_columns.return_value = PORT_SNMP_DATA
+    snmp.get_table.return_value = {}
+    if_table = PortsTable(
+        resource_model=NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", API
+        ),
+        ports_snmp_table=SnmpPortsTable(snmp, logger),
+        logger=logger,
+    )
+    if_table.PORT_CHANNEL_VALID_TYPE_LIST = [r"ieee8023adLag"]
+
+    with patch.object(
+        InterfaceClassifier,
+        "classify",
+        autospec=True,
+        side_effect=InterfaceClassifier.classify,
+    ) as classify:
+        for _ in range(2):
+            assert not if_table.port_channels_dict
+            assert if_table.ports_dict
+
+    assert classify.call_count == len(PORT_SNMP_DATA)
+
+
+def test_if_indexes_in_numeric_order():
+    logger = Mock()
+    snmp = Mock()
+    indexes = ["100", "2", "10", "1"]
+    snmp.get_multiple_columns.return_value = {
+        index: {
+            "ifDescr": Mock(safe_value=f"GigabitEthernet0/{index}"),
+            "ifType": Mock(safe_value="ethernetCsmacd"),
+        }
+        for index in indexes
+    }
+    snmp.get_table.return_value = {}
+    # entAliasMappingTable is walked in entPhysicalIndex order
+    snmp.walk.return_value = [
+        Mock(safe_value=f"IF-MIB::ifIndex.{index}", index=f"{1000 - int(index)}.0")
+        for index in indexes
+    ]
+    if_table = PortsTable(
+        resource_model=NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", API
+        ),
+        ports_snmp_table=SnmpPortsTable(snmp, logger),
+        logger=logger,
+    )
+
+    assert list(if_table.ports_dict) == ["1", "2", "10", "100"]
+    port_mapping = SnmpPortMappingTable(snmp, logger).port_mapping_snmp_table
+    assert list(port_mapping.items()) == [
+        ("1", "999"),
+        ("2", "998"),
+        ("10", "990"),
+        ("100", "900"),
+    ]
+
+
+def _create_pe_router_snmp():
+    """Interfaces of a PE router, 9 of every 10 are sub-interfaces."""
+    table = {}
+    for index in range(1, 1001):
+        name = f"TenGigE0/0/0/{index // 10}"
+        if index % 10:
+            name, if_type = f"{name}.{index}", "l2vlan"
+        elif index % 100:
+            if_type = "ethernetCsmacd"
+        else:
+            name, if_type = f"Bundle-Ether{index}", "ieee8023adLag"
+        values = {
+            "ifIndex": str(index),
+            "ifDescr": name,
+            "ifName": name,
+            "ifAlias": f"uplink {index}",
+            "ifType": if_type,
+            "ifMtu": "9000",
+            "ifHighSpeed": "10000",
+            "ifPhysAddress": f"00:00:00:00:{index // 256:02x}:{index % 256:02x}",
+        }
+        table[str(index)] = {
+            k: Mock(safe_value=v, index=str(index), mib_id=k) for k, v in values.items()
+        }
+
+    snmp = Mock()
+    snmp.get_multiple_columns.side_effect = lambda columns: {
+        index: {x.object_name: row[x.object_name] for x in columns}
+        for index, row in table.items()
+        if columns[0].object_name in row
+    }
+    snmp.get_list.side_effect = lambda oids: [
+        table[oid.index][oid.object_name] for oid in oids
+    ]
+    snmp.get_table.return_value = {}
+    return snmp
+
+
+def _dump_ports(if_table):
+    return [
+        (x.name, x.mac_address, x.mtu, x.bandwidth, x.port_description)
+        for x in if_table.ports_dict.values()
+    ] + [
+        (x.name, x.port_description, x.associated_ports)
+        for x in if_table.port_channels_dict.values()
+    ]
+
+
+def test_selective_retrieval_loads_details_of_ports_only():
+    logger = Mock()
+    full_table = PortsTable(
+        resource_model=NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", API
+        ),
+        ports_snmp_table=SnmpPortsTable(_create_pe_router_snmp(), logger),
+        logger=logger,
+    )
+    snmp = _create_pe_router_snmp()
+    selective_table = PortsTable(
+        resource_model=NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", API
+        ),
+        ports_snmp_table=SnmpPortsTable(snmp, logger, selective_retrieval=True),
+        logger=logger,
+    )
+
+    assert _dump_ports(selective_table) == _dump_ports(full_table)
+    assert len(selective_table.ports_dict) == 90
+    assert len(selective_table.port_channels_dict) == 10
+    walked_columns = snmp.get_multiple_columns.call_args_list[0][0][0]
+    assert walked_columns == IF_TABLE_CLASSIFICATION_COLUMNS
+    requested = {oid.index for c in snmp.get_list.call_args_list for oid in c[0][0]}
+    assert requested == set(selective_table.ports_dict) | set(
+        selective_table.port_channels_dict
+    )
+
+
+class SubInterfacesPortsTable(PortsTable):
+    def _is_valid_port(self, port):
+        return port.if_type == "l2vlan" and port.if_port_description.endswith("1")
+
+
+def _create_ports_table(snmp, table_class=PortsTable, selective_retrieval=False):
+    logger = Mock()
+    return table_class(
+        resource_model=NetworkingResourceModel(
+            "Resource Name", "Shell Name", "CS_Switch", API
+        ),
+        ports_snmp_table=SnmpPortsTable(
+            snmp, logger, selective_retrieval=selective_retrieval
+        ),
+        logger=logger,
+    )
+
+
+def test_selective_retrieval_walks_details_for_custom_validation():
+    full_table = _create_ports_table(_create_pe_router_snmp(), SubInterfacesPortsTable)
+    snmp = _create_pe_router_snmp()
+    selective_table = _create_ports_table(
+        snmp, SubInterfacesPortsTable, selective_retrieval=True
+    )
+
+    assert _dump_ports(selective_table) == _dump_ports(full_table)
+    # ifAlias is a details column
+    assert len(selective_table.ports_dict) == 100
+    snmp.get_list.assert_not_called()
+
+
+def test_selective_retrieval_walks_details_after_get_error():
+    full_table = _create_ports_table(_create_pe_router_snmp())
+    snmp = _create_pe_router_snmp()
+    snmp.get_list.side_effect = ReadSNMPException("genErr")
+    selective_table = _create_ports_table(snmp, selective_retrieval=True)
+
+    assert _dump_ports(selective_table) == _dump_ports(full_table)
+    assert len(selective_table.ports_dict) == 90
@@ -0,0 +1,204 @@
+import gc
+import logging
+import tracemalloc
+import weakref
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from cloudshell.shell.standards.networking.autoload_model import NetworkingResourceModel
+from cloudshell.snmp.core.domain.quali_mib_table import QualiMibTable
+
+from cloudshell.snmp.autoload.generic_snmp_autoload import GenericSNMPAutoload
+
+LOGGER = logging.getLogger(__name__)
+DEVICES_COUNT = 500
+MODULES_COUNT = 8
+PORTS_PER_MODULE = 48
+
+
+class Response:
+    """SnmpResponse stand-in keeping a raw payload like the pysnmp objects do."""
+
+    def __init__(self, value, index=None):
+        self._raw_value = value.encode().ljust(256)
+        self.index = index
+
+    @property
+    def safe_value(self):
+        return self._raw_value.rstrip().decode()
+
+
+def _entity_row(parent_id, position, entity_class, name, model=""):
+    values = {
+        "entPhysicalParentRelPos": position,
+        "entPhysicalDescr": name,
+        "entPhysicalName": name,
+        "entPhysicalContainedIn": parent_id,
+        "entPhysicalClass": entity_class,
+        "entPhysicalVendorType": "",
+        "entPhysicalModelName": model,
+        "entPhysicalSerialNum": f"SN{parent_id}{position}",
+        "entPhysicalSoftwareRev": "",
+        "entPhysicalHardwareRev": "",
+    }
+    return {k: Response(v) for k, v in values.items()}
+
+
+class SnmpService:
+    """SnmpService stand-in for a device with line cards of ports.
+
+    Every walk returns new responses, plain classes are used instead of Mock
+    as every Mock creates a new class.
+    """
+
+    def __init__(self, modules_count, ports_per_module):
+        self._modules_count = modules_count
+        self._ports_per_module = ports_per_module
+
+    def _iter_ports(self):
+        for module_id in range(1, self._modules_count + 1):
+            for port_id in range(1, self._ports_per_module + 1):
+                yield module_id, port_id
+
+    def _get_entities(self):
+        table = QualiMibTable("entPhysicalTable")
+        table["1"] = _entity_row("0", "-1", "chassis", "Chassis", "C9400")
+        for module_id in range(1, self._modules_count + 1):
+            table[str(module_id * 1000)] = _entity_row(
+                "1", str(module_id), "module", f"Slot {module_id}", "LC-48"
+            )
+        for module_id, port_id in self._iter_ports():
+            table[str(module_id * 1000 + port_id)] = _entity_row(
+                str(module_id * 1000),
+                str(port_id),
+                "port",
+                f"GigabitEthernet{module_id}/0/{port_id}",
+            )
+        return table
+
+    def _get_interfaces(self):
+        table = QualiMibTable("ifTable")
+        for module_id, port_id in self._iter_ports():
+            if_index = str(module_id * 100 + port_id)
+            table[if_index] = {
+                "ifIndex": Response(if_index),
+                "ifDescr": Response(f"GigabitEthernet{module_id}/0/{port_id}"),
+                "ifType": Response("ethernetCsmacd"),
+                "ifSpeed": Response("1000000000"),
+            }
+        return table
+
+    def get_multiple_columns(self, columns):
+        if columns[0].object_name.startswith("ent"):
+            return self._get_entities()
+        if columns[0].object_name.startswith("if"):
+            return self._get_interfaces()
+        return QualiMibTable("table")
+
+    def walk(self, oid):
+        if oid.object_name != "entAliasMappingIdentifier":
+            return []
+        return [
+            Response(
+                f"IF-MIB::ifIndex.{module_id * 100 + port_id}",
+                f"{module_id * 1000 + port_id}.0",
+            )
+            for module_id, port_id in self._iter_ports()
+        ]
+
+    def get_table(self, oid):
+        return {}
+
+    def get_property(self, oid):
+        return Response("")
+
+
+class SystemInfo:
+    def is_valid_device_os(self, supported_os):
+        return True
+
+    def fill_attributes(self, resource_model):
+        pass
+
+
+class CloudShellAPI:
+    def GetResourceDetails(self, name):  # noqa: N802
+        return SimpleNamespace(UniqeIdentifier="", ChildResources=[])
+
+
+def _discover(
+    compact=True, modules_count=MODULES_COUNT, ports_per_module=PORTS_PER_MODULE
+):
+    resource_model = NetworkingResourceModel(
+        "Resource Name", "Shell Name", "CS_Switch", CloudShellAPI()
+    )
+    autoload = GenericSNMPAutoload(
+        SnmpService(modules_count, ports_per_module), LOGGER, resource_model
+    )
+    autoload._system_info = SystemInfo()
+    if not compact:
+        autoload._compact = Mock()
+    autoload.discover("")
+    return autoload, resource_model
+
+
+def _measure_discovery(compact=True):
+    tracemalloc.start()
+    try:
+        autoload, _ = _discover(compact)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return autoload, retained, peak
+
+
+def test_raw_tables_released_after_discovery():
+    autoload, _ = _discover()
+
+    assert not autoload.snmp_physical_structure.physical_structure_snmp_table
+    assert not autoload.port_snmp_table.port_table
+    assert not autoload.port_table_service._if_entities
+    assert not autoload.physical_table_service._entities
+    assert autoload.physical_table_service.physical_ports_list
+
+
+def test_discovery_memory_footprint():
+    autoload, retained, peak = _measure_discovery()
+    _, not_compacted_retained, not_compacted_peak = _measure_discovery(compact=False)
+    LOGGER.info(
+        f"{MODULES_COUNT * PORTS_PER_MODULE} ports discovered: "
+        f"peak {peak / 2**20:.1f} MiB, retained {retained / 2**20:.1f} MiB, "
+        f"without compact peak {not_compacted_peak / 2**20:.1f} MiB, "
+        f"retained {not_compacted_retained / 2**20:.1f} MiB"
+    )
+
+    chassis = autoload.physical_table_service.physical_chassis_dict["1"]
+    assert len(chassis.extract_sub_resources()) == MODULES_COUNT
+    # the rest is the discovered resource model
+    assert retained < not_compacted_retained * 0.75
+
+
+def test_discovered_devices_released():
+    """Nothing of a finished discovery is kept by the package.
+
+    Resource attributes of cloudshell-shell-standards keep values of every
+    resource ever created in class level containers keyed by the resource, so
+    the resource models themselves leak upstream and are not checked here.
+    """
+    refs = []
+    for _ in range(DEVICES_COUNT):
+        autoload, _ = _discover(modules_count=1, ports_per_module=4)
+        refs.extend(
+            weakref.ref(x)
+            for x in (
+                autoload,
+                autoload.snmp_physical_structure,
+                autoload.physical_table_service,
+                autoload.port_snmp_table,
+                autoload.port_table_service,
+            )
+        )
+    del autoload
+    gc.collect()
+
+    assert not [x for x in refs if x() is not None]